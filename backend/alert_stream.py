@@ -0,0 +1,88 @@
+"""
+Alert Push Channel
+Server-Sent Events fan-out of alert changes per (district, mode)
+
+Every new weather snapshot publishes the freshly built alerts; subscribers
+only receive an event when the set of alerts actually differs from the
+previous snapshot.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from json_codec import dumps
+
+Key = Tuple[str, str]
+
+
+def alert_fingerprint(alerts: List[Dict[str, Any]]) -> frozenset:
+    """Identity of an alert set; ignores per-build fields such as valid_until"""
+    return frozenset((a['type'], a['severity'], a['title']) for a in alerts)
+
+
+def sse_event(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + dumps(data).decode("utf-8"))
+    return "\n".join(lines) + "\n\n"
+
+
+class AlertBroadcaster:
+    """
+    Keeps the latest alert set per key and fans changes out to subscriber queues
+    """
+
+    def __init__(self, queue_size: int = 8):
+        self.queue_size = queue_size
+        self._latest: Dict[Key, Tuple[int, frozenset, Dict[str, Any]]] = {}
+        self._subscribers: Dict[Key, Set[asyncio.Queue]] = {}
+
+    def latest(self, key: Key) -> Optional[Tuple[int, Dict[str, Any]]]:
+        entry = self._latest.get(key)
+        return None if entry is None else (entry[0], entry[2])
+
+    def publish(self, key: Key, payload: Dict[str, Any]) -> bool:
+        """
+        Records payload ({"alerts": [...]}) for key; notifies subscribers and
+        returns True only if the alert set changed
+        """
+        fingerprint = alert_fingerprint(payload['alerts'])
+        previous = self._latest.get(key)
+        if previous is not None and previous[1] == fingerprint:
+            return False
+        version = previous[0] + 1 if previous else 1
+        self._latest[key] = (version, fingerprint, payload)
+        for queue in self._subscribers.get(key, ()):
+            if queue.full():
+                queue.get_nowait()  # slow client: drop the oldest pending update
+            queue.put_nowait((version, payload))
+        return True
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def stream(self, key: Key, keepalive: float = 15.0) -> AsyncIterator[str]:
+        """
+        SSE body for one subscriber: the current alerts first, then one event
+        per change, with comment keep-alives in between
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(key, set()).add(queue)
+        try:
+            current = self.latest(key)
+            if current is not None:
+                yield sse_event("alerts", current[1], current[0])
+            while True:
+                try:
+                    version, payload = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse_event("alerts", payload, version)
+        finally:
+            queues = self._subscribers.get(key)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[key]
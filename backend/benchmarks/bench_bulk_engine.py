@@ -0,0 +1,119 @@
+"""
+Bulk engine benchmark
+Compares the per-location path (get_signals + get_smart_guidance per mode)
+with one vectorized bulk_engine.evaluate pass, on synthetic weather
+
+Usage (from backend/):
+    python benchmarks/bench_bulk_engine.py [--locations 495] [--hours 168]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulk_engine import LocationTable, WeatherGrid, evaluate, load_locations  # noqa: E402
+from main import USER_MODES, get_signals  # noqa: E402
+from phase1_rules import HourlySeries, WeatherInput, forecast_stability, get_smart_guidance, rule_engine  # noqa: E402
+
+CONDITIONS = ["Clear", "Cloudy", "Rainy", "Stormy"]
+
+
+def synthetic_table(n: int) -> LocationTable:
+    """Replicates the shipped district table (with jittered coords) up to n rows"""
+    base = load_locations()
+    reps = -(-n // len(base))
+    rng = np.random.default_rng(0)
+    return LocationTable(
+        names=[f"{name}-{r}" for r in range(reps) for name in base.names][:n],
+        divisions=(base.divisions * reps)[:n],
+        lat=(np.tile(base.lat, reps) + rng.uniform(-0.2, 0.2, reps * len(base)))[:n],
+        lng=(np.tile(base.lng, reps) + rng.uniform(-0.2, 0.2, reps * len(base)))[:n],
+    )
+
+
+def synthetic_weather(table: LocationTable, hours: int):
+    rng = np.random.default_rng(1)
+    # Starts at the current (UTC) hour, so both paths evaluate the same hours
+    start = datetime.datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    times = [(start + datetime.timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M") for h in range(hours)]
+    snapshots = []
+    for name, division in zip(table.names, table.divisions):
+        temps = (30 + 6 * np.sin(np.arange(hours) / 24 * 2 * np.pi) + rng.normal(0, 2, hours)).round(1)
+        humid = rng.uniform(50, 95, hours).round()
+        precip = np.clip(rng.exponential(2, hours) - 1, 0, None).round(1)
+        snapshots.append({
+            "district": f"{division}/{name}",
+            "temperature": float(temps[0]),
+            "condition": CONDITIONS[int(rng.integers(len(CONDITIONS)))],
+            "humidity": float(humid[0]),
+            "precipitation": float(precip[0]),
+            "windspeed": float(rng.uniform(0, 60)),
+            "hourly": {
+                "time": times,
+                "temperature_2m": temps.tolist(),
+                "relative_humidity_2m": humid.tolist(),
+                "precipitation": precip.tolist(),
+            },
+        })
+    return snapshots
+
+
+def per_location(table: LocationTable, snapshots, hours: int):
+    for i, weather in enumerate(snapshots):
+        get_signals(weather, table.lat[i], table.lng[i], table.names[i])
+        series = HourlySeries.from_open_meteo(weather['hourly'], hours=hours)
+        current = WeatherInput(
+            temperature=weather['temperature'],
+            humidity=weather['humidity'],
+            rain_probability=min(weather['precipitation'] / 10, 1.0),
+            wind_speed=weather['windspeed'],
+            heat_index=weather['temperature'] + weather['humidity'] / 10,
+            lightning_risk=0.8 if "Storm" in weather['condition'] else 0.1,
+            forecast_stability=forecast_stability(series),
+        )
+        for mode in USER_MODES:
+            get_smart_guidance(mode, current, series)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--locations", type=int, default=495)
+    parser.add_argument("--hours", type=int, default=168)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    table = synthetic_table(args.locations)
+    snapshots = synthetic_weather(table, args.hours)
+    rules = rule_engine.rules
+
+    def timed(fn):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    grid_time = timed(lambda: WeatherGrid.from_weather(snapshots, hours=args.hours))
+    grid = WeatherGrid.from_weather(snapshots, hours=args.hours)
+    bulk_time = timed(lambda: evaluate(table, grid, rules))
+    loop_time = timed(lambda: per_location(table, snapshots, args.hours))
+    result = evaluate(table, grid, rules)
+
+    n = len(table)
+    print(f"locations={n} hours={args.hours} modes={len(USER_MODES)}")
+    print(f"per-location loop : {loop_time * 1000:8.2f} ms  {n / loop_time:12,.0f} locations/s")
+    print(f"grid build        : {grid_time * 1000:8.2f} ms")
+    print(f"bulk evaluate     : {bulk_time * 1000:8.2f} ms  {n / bulk_time:12,.0f} locations/s")
+    print(f"bulk incl. build  : {(grid_time + bulk_time) * 1000:8.2f} ms  {n / (grid_time + bulk_time):12,.0f} locations/s")
+    print(f"result storage    : {result.nbytes() / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
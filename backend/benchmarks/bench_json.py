@@ -0,0 +1,76 @@
+"""
+JSON path benchmark
+Compares the standard library path (bytes -> str -> json.loads; jsonable_encoder
++ json.dumps for responses) with json_codec on realistic payloads
+
+Usage (from backend/):
+    python benchmarks/bench_json.py [--locations 100] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec  # noqa: E402
+from bench_bulk_engine import synthetic_table, synthetic_weather  # noqa: E402
+
+
+def open_meteo_batch(snapshots):
+    """Upstream-shaped batch body: one forecast object per location, 7 days hourly"""
+    return [
+        {
+            "latitude": 23.8, "longitude": 90.4, "timezone": "Asia/Dhaka",
+            "current_weather": {"temperature": w['temperature'], "windspeed": w['windspeed'], "weathercode": 2, "time": "2026-01-01T00:00"},
+            "hourly": {**w['hourly'], "weathercode": [2] * len(w['hourly']['time'])},
+            "daily": {"time": ["2026-01-01"] * 7, "temperature_2m_max": [33.1] * 7, "temperature_2m_min": [24.2] * 7},
+        }
+        for w in snapshots
+    ]
+
+
+def stdlib_decode(body: bytes):
+    return json.loads(body.decode())
+
+
+def stdlib_encode(payload) -> bytes:
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--locations", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    snapshots = synthetic_weather(synthetic_table(args.locations), 168)
+    upstream_body = json.dumps(open_meteo_batch(snapshots)).encode("utf-8")
+    response = {"districts": {w['district']: {"current_weather": w, "alerts": []} for w in snapshots}}
+
+    def timed(fn, arg):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn(arg)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    print(f"backend={json_codec.BACKEND} locations={args.locations}")
+    rows = [
+        (f"decode upstream ({len(upstream_body) / 1024:.0f} KiB)", stdlib_decode, json_codec.loads, upstream_body),
+        (f"encode response ({len(json_codec.dumps(response)) / 1024:.0f} KiB)", stdlib_encode, json_codec.dumps, response),
+    ]
+    for label, baseline, fast, arg in rows:
+        slow_time, fast_time = timed(baseline, arg), timed(fast, arg)
+        print(f"{label:28s} stdlib {slow_time * 1000:8.2f} ms   codec {fast_time * 1000:8.2f} ms   x{slow_time / fast_time:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Engine micro-benchmarks
+Per-call latency of the signal engine, insight generation, smart guidance,
+trends and JSON encoding, on the recorded fixture payloads, and of news
+queries against a synthetic store of --articles articles
+
+Usage (from backend/):
+    python benchmarks/bench_micro.py [--calls 20000] [--compare latest] [--no-save]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import add_result_arguments, finish, offline_env, summarize  # noqa: E402
+
+offline_env()
+
+from fake_open_meteo import load_fixtures, rebase  # noqa: E402
+from http_cache import encode_json  # noqa: E402
+import json_codec  # noqa: E402
+import main  # noqa: E402
+from news_store import NATIONAL, Article, NewsStore  # noqa: E402
+from phase1_rules import HourlySeries, WeatherInput, forecast_stability, get_smart_guidance  # noqa: E402
+from trend_engine import compute_trends  # noqa: E402
+
+
+def measure(fn, calls: int):
+    """Times every call individually; returns (latencies, elapsed)"""
+    latencies = []
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(calls):
+        t0 = clock()
+        fn()
+        latencies.append(clock() - t0)
+    return latencies, clock() - started
+
+
+def cases(weather, district: str):
+    coords = main.LOCATION_COORDS[district]
+    signals = main.get_signals(weather, coords['lat'], coords['lng'], district)
+    series = HourlySeries.from_open_meteo(weather['hourly'], hours=24)
+    current = WeatherInput(
+        temperature=weather['temperature'],
+        humidity=weather['humidity'],
+        rain_probability=min(weather['precipitation'] / 10, 1.0),
+        wind_speed=weather['windspeed'],
+        heat_index=weather['temperature'] + weather['humidity'] / 10,
+        lightning_risk=0.8 if "Storm" in weather['condition'] else 0.1,
+        forecast_stability=forecast_stability(series),
+    )
+    insights_payload = main.build_home_insights(weather, district, "farmer", expand=True)
+    return {
+        "get_signals": lambda: main.get_signals(weather, coords['lat'], coords['lng'], district),
+        "generate_insights[farmer]": lambda: main.generate_insights(signals, "farmer", district),
+        "get_smart_guidance[worker]": lambda: get_smart_guidance("worker", current, series),
+        "get_smart_guidance[general]": lambda: get_smart_guidance("general", current, series),
+        "build_smart_guidance[worker]": lambda: main.build_smart_guidance(weather, district, "worker"),
+        "compute_trends": lambda: compute_trends(weather, 40),
+        "build_forecast": lambda: main.build_forecast(weather, district, main.FORECAST_MODE),
+        "encode_json[insights+hourly]": lambda: encode_json(insights_payload),
+        "json.dumps[insights+hourly]": lambda: json.dumps(insights_payload, ensure_ascii=False).encode(),
+    }
+
+
+def news_cases(n_articles: int, district: str):
+    """Store of n_articles spread over every district (a tenth national), rendered as the API does"""
+    rng = random.Random(1)
+    districts = list(main.LOCATION_COORDS) + [NATIONAL] * (len(main.LOCATION_COORDS) // 10)
+    sources = main.TRUSTED_SOURCES + ["Facebook Group"]
+    categories = ["flood", "cyclone", "heatwave", "monsoon", "general"]
+    now = time.time()
+    articles = [
+        Article(
+            id=str(i), headline=f"Article {i}", bn_headline="", summary="", source=source, url="",
+            published_at=now - rng.uniform(0, 30 * 86400), districts=(rng.choice(districts),),
+            category=rng.choice(categories), trusted=source in main.TRUSTED_SOURCES,
+        )
+        for i in range(n_articles)
+        for source in [rng.choice(sources)]
+    ]
+    store = NewsStore(articles, render=main.render_news_item)
+    return {
+        f"news[{district}]": lambda: store.query(district, None, True, 0, 20),
+        f"news[{district}, flood, page 5]": lambda: store.query(district, "flood", True, 80, 20),
+        "news[all districts]": lambda: store.query(None, None, True, 0, 20),
+    }
+
+
+def run_cases(cases_: dict, calls: int, label: str, results: dict) -> None:
+    for name, fn in cases_.items():
+        for _ in range(min(calls // 10, 1000)):  # warm-up
+            fn()
+        latencies, elapsed = measure(fn, calls)
+        results[f"{name} ({label})"] = summarize(latencies, elapsed)
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--district", default="Sylhet")
+    parser.add_argument("--articles", type=int, default=5000, help="news store size")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    now = datetime.datetime.utcnow() + datetime.timedelta(hours=6)
+    results = {}
+    for label, fixture in load_fixtures().items():
+        weather = main.parse_weather(rebase(fixture, now))
+        run_cases(cases(weather, args.district), args.calls, label.replace("open_meteo_", ""), results)
+    run_cases(news_cases(args.articles, args.district), args.calls, f"{args.articles} articles", results)
+
+    finish("micro", args, results, {"calls": args.calls, "district": args.district, "articles": args.articles, "json_backend": json_codec.BACKEND})
+
+
+if __name__ == "__main__":
+    main_()
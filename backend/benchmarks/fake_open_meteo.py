@@ -0,0 +1,199 @@
+"""
+Fake Open-Meteo server
+Local stand-in for api.open-meteo.com/v1/forecast that replays the recorded
+payloads in benchmarks/fixtures, with injectable latency and failures
+
+Each point gets one of the fixtures (picked from its coordinates), with the
+timeline moved to today in Asia/Dhaka time so the current hour falls inside
+the forecast. Comma-separated latitude/longitude lists return a JSON array,
+like the real API.
+
+Usage (from backend/):
+    python benchmarks/fake_open_meteo.py --port 8099 --latency-ms 80 --jitter-ms 40 --failure-rate 0.05
+    OPEN_METEO_URL=http://127.0.0.1:8099/v1/forecast uvicorn main:app
+"""
+
+import argparse
+import copy
+import datetime
+import glob
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixtures(directory: str = FIXTURES_DIR) -> Dict[str, Dict[str, Any]]:
+    """{file name without .json: payload}"""
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            fixtures[os.path.splitext(os.path.basename(path))[0]] = json.load(f)
+    if not fixtures:
+        raise FileNotFoundError(f"no fixture payloads in {directory}")
+    return fixtures
+
+
+def rebase(fixture: Dict[str, Any], now: datetime.datetime) -> Dict[str, Any]:
+    """Copy of fixture whose first day is now's date; current_weather is the current quarter hour"""
+    payload = copy.deepcopy(fixture)
+    first = datetime.datetime.fromisoformat(payload['hourly']['time'][0])
+    shift = datetime.datetime.combine(now.date(), datetime.time()) - first
+    payload['hourly']['time'] = [
+        (datetime.datetime.fromisoformat(t) + shift).strftime("%Y-%m-%dT%H:%M") for t in payload['hourly']['time']
+    ]
+    payload['daily']['time'] = [
+        (datetime.date.fromisoformat(d) + datetime.timedelta(days=shift.days)).isoformat() for d in payload['daily']['time']
+    ]
+    hour = min(now.hour, len(payload['hourly']['time']) - 1)
+    current = payload['current_weather']
+    current['time'] = now.replace(minute=now.minute - now.minute % 15).strftime("%Y-%m-%dT%H:%M")
+    current['temperature'] = payload['hourly']['temperature_2m'][hour]
+    current['weathercode'] = payload['hourly']['weathercode'][hour]
+    return payload
+
+
+class FakeOpenMeteo:
+    """
+    Threaded HTTP server; start() returns the forecast URL
+
+    latency: base delay per request (s), plus uniform jitter in [0, jitter]
+    failure_rate: share of requests answered with HTTP 500
+    hang_rate: share of requests that stall for hang seconds (client timeouts)
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        hang: float = 30.0,
+        seed: Optional[int] = None,
+        fixtures_dir: str = FIXTURES_DIR,
+    ):
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.hang = hang
+        self.fixtures = list(load_fixtures(fixtures_dir).values())
+        self.requests = 0
+        self.points = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._rebased: Dict[str, List[Dict[str, Any]]] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1/forecast"
+
+    def start(self) -> str:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, body = fake.handle(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "points": self.points, "failures": self.failures}
+
+    def _payloads_for_now(self) -> List[Dict[str, Any]]:
+        now = datetime.datetime.utcnow() + datetime.timedelta(hours=6)  # fixtures are Asia/Dhaka
+        key = now.strftime("%Y-%m-%dT%H:%M")[:-1]  # re-rebase every 10 minutes at most
+        with self._lock:
+            if key not in self._rebased:
+                self._rebased = {key: [rebase(f, now) for f in self.fixtures]}
+            return self._rebased[key]
+
+    def handle(self, path: str):
+        with self._lock:
+            self.requests += 1
+            roll_fail, roll_hang = self._random.random(), self._random.random()
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if roll_hang < self.hang_rate:
+            time.sleep(self.hang)
+        elif delay:
+            time.sleep(delay)
+
+        url = urlparse(path)
+        query = parse_qs(url.query)
+        if url.path != "/v1/forecast" or "latitude" not in query or "longitude" not in query:
+            return 400, b'{"error":true,"reason":"latitude and longitude are required"}'
+        if roll_fail < self.failure_rate:
+            with self._lock:
+                self.failures += 1
+            return 500, b'{"error":true,"reason":"injected failure"}'
+
+        lats = [float(v) for v in query["latitude"][0].split(",")]
+        lngs = [float(v) for v in query["longitude"][0].split(",")]
+        payloads = self._payloads_for_now()
+        points = []
+        for lat, lng in zip(lats, lngs):
+            payload = dict(payloads[hash((round(lat, 2), round(lng, 2))) % len(payloads)])
+            payload['latitude'], payload['longitude'] = lat, lng
+            points.append(payload)
+        with self._lock:
+            self.points += len(points)
+        body = points if len(points) > 1 else points[0]
+        return 200, json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server = FakeOpenMeteo(
+        port=args.port, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        failure_rate=args.failure_rate, hang_rate=args.hang_rate, seed=args.seed,
+    )
+    print(f"fake Open-Meteo on {server.start()} ({len(server.fixtures)} fixtures), Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
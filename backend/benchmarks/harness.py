@@ -0,0 +1,147 @@
+"""
+Benchmark harness helpers
+Latency summaries, result files and run-to-run comparison shared by the
+micro-benchmarks and the load test
+
+Results are written to benchmarks/results/<suite>-<timestamp>.json; pass
+--compare <file> (or --compare latest) to print the change against an earlier run.
+"""
+
+import datetime
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+
+def offline_env() -> None:
+    """
+    Makes `import main` safe for benchmarks: no shared-memory file, a throwaway
+    snapshot database, no background prefetch. Call before importing main.
+    """
+    os.environ.setdefault("SHARED_STATE_PATH", "")
+    os.environ.setdefault("SNAPSHOT_DB", os.path.join(tempfile.mkdtemp(prefix="bench-"), "snapshots.db"))
+    os.environ.setdefault("PREFETCH_ENABLED", "0")
+    os.environ.setdefault("RULES_POLL", "0")
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return float("nan")
+    rank = max(int(round(q / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, Any]:
+    """
+    latencies: seconds per operation; elapsed: wall time the operations took
+    Returns throughput (ops/s) and latency percentiles in milliseconds.
+    """
+    values = sorted(latencies)
+    ms = 1000.0
+    return {
+        "count": len(values),
+        "errors": errors,
+        "throughput": len(values) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": sum(values) / len(values) * ms if values else float("nan"),
+        "p50_ms": percentile(values, 50) * ms,
+        "p95_ms": percentile(values, 95) * ms,
+        "p99_ms": percentile(values, 99) * ms,
+        "max_ms": values[-1] * ms if values else float("nan"),
+    }
+
+
+def print_table(results: Dict[str, Dict[str, Any]], unit: str = "ops/s") -> None:
+    print(f"{'name':44s} {'count':>8s} {'err':>5s} {unit:>12s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}")
+    for name, r in results.items():
+        print(
+            f"{name:44s} {r['count']:8d} {r['errors']:5d} {r['throughput']:12,.1f}"
+            f" {r['p50_ms']:9.3f} {r['p95_ms']:9.3f} {r['p99_ms']:9.3f}"
+        )
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def save_results(suite: str, results: Dict[str, Dict[str, Any]], config: Dict[str, Any]) -> str:
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(RESULTS_DIR, f"{suite}-{stamp}.json")
+    document = {
+        "suite": suite,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+def latest_results(suite: str, exclude: Optional[str] = None) -> Optional[str]:
+    paths = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, f"{suite}-*.json")) if p != exclude)
+    return paths[-1] if paths else None
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline_path: str) -> None:
+    """Prints throughput and p50/p99 change per benchmark against a saved run"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\ncompared with {os.path.relpath(baseline_path, BACKEND_DIR)}")
+    print(f"{'name':44s} {'throughput':>12s} {'p50':>9s} {'p99':>9s}")
+
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+8.1f}%" if old else f"{'n/a':>9s}"
+
+    for name, r in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:44s} {'(new)':>12s}")
+            continue
+        print(
+            f"{name:44s} {change(r['throughput'], old['throughput']):>12s}"
+            f" {change(r['p50_ms'], old['p50_ms'])} {change(r['p99_ms'], old['p99_ms'])}"
+        )
+
+
+def add_result_arguments(parser) -> None:
+    parser.add_argument("--no-save", action="store_true", help="don't write a results file")
+    parser.add_argument("--compare", metavar="FILE", help="results file to compare with, or 'latest'")
+
+
+def finish(suite: str, args, results: Dict[str, Dict[str, Any]], config: Dict[str, Any]) -> None:
+    """Prints, saves and optionally compares one run"""
+    print_table(results)
+    saved = None
+    if not args.no_save:
+        saved = save_results(suite, results, config)
+        print(f"\nsaved {os.path.relpath(saved, BACKEND_DIR)}")
+    if args.compare:
+        baseline = latest_results(suite, exclude=saved) if args.compare == "latest" else args.compare
+        if baseline is None:
+            print("no earlier results to compare with")
+        else:
+            compare(results, baseline)
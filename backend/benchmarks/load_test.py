@@ -0,0 +1,222 @@
+"""
+Load test
+Runs the API under uvicorn against the fake Open-Meteo server and drives every
+/api/v1 endpoint with concurrent virtual users; nothing leaves the machine
+
+Each virtual user loops over a weighted mix of endpoints with a random
+district and mode. Alert-stream clients are measured separately: they connect,
+time the first event, and reconnect. Requests during --warmup are not counted.
+
+Usage (from backend/):
+    python benchmarks/load_test.py [--users 32] [--duration 30] [--warmup 5]
+        [--upstream-latency-ms 80] [--upstream-jitter-ms 40] [--upstream-failure-rate 0.02]
+        [--workers 1] [--prefetch] [--compare latest] [--no-save]
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_open_meteo import FakeOpenMeteo  # noqa: E402
+from harness import BACKEND_DIR, add_result_arguments, finish, summarize  # noqa: E402
+
+# main is only imported for its mode list: keep this process off the shared
+# state file and the snapshot history (start_api sets both for the API)
+sys.path.insert(0, BACKEND_DIR)
+os.environ.update(SHARED_STATE_PATH="", SNAPSHOT_DB=os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "driver.db"))
+from main import USER_MODES as MODES  # noqa: E402
+
+# endpoint name: (weight, path template)
+MIX = {
+    "insights/home": (30, "/api/v1/insights/home?district={district}&mode={mode}"),
+    "alerts": (20, "/api/v1/alerts?district={district}&mode={mode}"),
+    "smart-guidance": (15, "/api/v1/smart-guidance?district={district}&mode={mode}"),
+    "forecast": (15, "/api/v1/forecast?district={district}"),
+    "news-insights": (10, "/api/v1/news-insights?district={district}"),
+    "insights/bulk": (5, "/api/v1/insights/bulk?districts=all&mode={mode}"),
+    "health": (5, "/api/v1/health"),
+}
+
+
+def load_districts() -> List[str]:
+    with open(os.path.join(BACKEND_DIR, "data", "districts.csv"), encoding="utf-8") as f:
+        return [row["name"] for row in csv.DictReader(f)]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_api(port: int, upstream_url: str, args) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        OPEN_METEO_URL=upstream_url,
+        SNAPSHOT_DB=os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "snapshots.db"),
+        SHARED_STATE_PATH="" if args.workers == 1 else os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "state.bin"),
+        PREFETCH_ENABLED="1" if args.prefetch else "0",
+        PREFETCH_OFFSET="0",
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+async def wait_ready(base: str, proc: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base) as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"API exited with code {proc.returncode}")
+            try:
+                if (await client.get("/api/v1/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"API not ready after {timeout:.0f}s")
+
+
+class Recorder:
+    """Per-endpoint latencies and errors, counted only after warmup"""
+
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, name: str, started: float, latency: float, ok: bool) -> None:
+        if started < self.measure_from:
+            return
+        if ok:
+            self.latencies.setdefault(name, []).append(latency)
+        else:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+async def virtual_user(client: httpx.AsyncClient, recorder: Recorder, stop_at: float, districts: List[str], rng: random.Random):
+    names = list(MIX)
+    weights = [MIX[n][0] for n in names]
+    while time.monotonic() < stop_at:
+        name = rng.choices(names, weights)[0]
+        path = MIX[name][1].format(district=rng.choice(districts), mode=rng.choice(MODES))
+        started = time.monotonic()
+        try:
+            response = await client.get(path)
+            ok = response.status_code < 400 and not response.content.startswith(b'{"error"')
+        except httpx.HTTPError:
+            ok = False
+        recorder.record(name, started, time.monotonic() - started, ok)
+
+
+async def stream_client(client: httpx.AsyncClient, recorder: Recorder, stop_at: float, districts: List[str], rng: random.Random):
+    """Connects to the alert stream and times the first event; reconnects until stop_at"""
+    while time.monotonic() < stop_at:
+        path = f"/api/v1/alerts/stream?district={rng.choice(districts)}&mode={rng.choice(MODES)}"
+        started = time.monotonic()
+        ok = False
+        try:
+            async with client.stream("GET", path) as response:
+                if response.status_code == 200:
+                    async for line in response.aiter_lines():
+                        if line.startswith("data:"):
+                            ok = True
+                            break
+        except httpx.HTTPError:
+            pass
+        recorder.record("alerts/stream (first event)", started, time.monotonic() - started, ok)
+
+
+async def run(base: str, args) -> Dict[str, Dict]:
+    districts = load_districts()
+    if args.districts:
+        districts = districts[:args.districts]
+    now = time.monotonic()
+    recorder = Recorder(now + args.warmup)
+    stop_at = now + args.warmup + args.duration
+    limits = httpx.Limits(max_connections=args.users + args.stream_clients, max_keepalive_connections=args.users + args.stream_clients)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=args.timeout) as client:
+        tasks = [
+            virtual_user(client, recorder, stop_at, districts, random.Random(args.seed + i))
+            for i in range(args.users)
+        ] + [
+            stream_client(client, recorder, stop_at, districts, random.Random(args.seed + 10_000 + i))
+            for i in range(args.stream_clients)
+        ]
+        await asyncio.gather(*tasks)
+
+    elapsed = time.monotonic() - recorder.measure_from
+    results = {}
+    for name in list(MIX) + ["alerts/stream (first event)"]:
+        latencies = recorder.latencies.get(name, [])
+        errors = recorder.errors.get(name, 0)
+        if latencies or errors:
+            results[name] = summarize(latencies, elapsed, errors)
+    everything = [x for values in recorder.latencies.values() for x in values]
+    results["total"] = summarize(everything, elapsed, sum(recorder.errors.values()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=32, help="concurrent virtual users")
+    parser.add_argument("--stream-clients", type=int, default=4, help="concurrent alert-stream clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds before measuring starts")
+    parser.add_argument("--districts", type=int, default=0, help="limit to the first N districts (0 = all)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="client timeout per request (s)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--prefetch", action="store_true", help="run the background prefetcher")
+    parser.add_argument("--upstream-latency-ms", type=float, default=80.0)
+    parser.add_argument("--upstream-jitter-ms", type=float, default=40.0)
+    parser.add_argument("--upstream-failure-rate", type=float, default=0.0)
+    parser.add_argument("--upstream-hang-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    fake = FakeOpenMeteo(
+        latency=args.upstream_latency_ms / 1000, jitter=args.upstream_jitter_ms / 1000,
+        failure_rate=args.upstream_failure_rate, hang_rate=args.upstream_hang_rate, seed=args.seed,
+    )
+    upstream_url = fake.start()
+    port = free_port()
+    api = start_api(port, upstream_url, args)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        asyncio.run(wait_ready(base, api))
+        print(f"API on {base}, fake Open-Meteo on {upstream_url}; "
+              f"{args.users} users + {args.stream_clients} stream clients for {args.warmup:g}s warmup + {args.duration:g}s")
+        results = asyncio.run(run(base, args))
+    finally:
+        api.terminate()
+        try:
+            api.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            api.kill()
+        fake.stop()
+
+    upstream = fake.stats()
+    print(f"upstream: {upstream['requests']} requests, {upstream['points']} points, {upstream['failures']} injected failures\n")
+    config = {k: v for k, v in vars(args).items() if k not in ("compare", "no_save")}
+    config["upstream"] = upstream
+    finish("load", args, results, config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Bulk Evaluation Engine
+Runs the weather signal engine and every smart guidance mode across a whole
+location table (districts, upazilas, grid cells) in one vectorized pass
+
+Mirrors get_signals (main.py) and the phase1_rules decision functions, but
+stores results as small integer code arrays instead of per-location dicts.
+Thresholds and decisions come from the same compiled rule table.
+"""
+
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rule_table import REQUIRED_DECISIONS, RuleSet
+from time_axis import time_axis
+
+DEFAULT_LOCATIONS_FILE = os.path.join(os.path.dirname(__file__), "data", "districts.csv")
+
+# Rule table decisions evaluated per location; their outcomes label the int8 code arrays
+DECISIONS = REQUIRED_DECISIONS
+SIGNAL_TYPES = ("heavy_rain", "flood_risk", "cyclone", "heat_stress", "lightning")
+
+
+# ============================================================================
+# LOCATION TABLE
+# ============================================================================
+
+@dataclass
+class LocationTable:
+    """Array-backed table of named points"""
+    names: List[str]
+    divisions: List[str]
+    lat: np.ndarray
+    lng: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        return self.names.index(name)
+
+    def coords(self, i: int) -> Dict[str, float]:
+        return {'lat': float(self.lat[i]), 'lng': float(self.lng[i])}
+
+    def as_points(self) -> Dict[str, Dict[str, float]]:
+        """{name: {'lat', 'lng'}}, the shape fetch_weather_batch takes"""
+        return {name: self.coords(i) for i, name in enumerate(self.names)}
+
+
+def load_locations(path: str = DEFAULT_LOCATIONS_FILE) -> LocationTable:
+    """
+    Loads a location table from CSV (name,division,lat,lng header) or a JSON
+    list of {"name", "division", "lat", "lng"} objects
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+    return LocationTable(
+        names=[row['name'] for row in rows],
+        divisions=[row.get('division', '') for row in rows],
+        lat=np.array([float(row['lat']) for row in rows]),
+        lng=np.array([float(row['lng']) for row in rows]),
+    )
+
+
+# ============================================================================
+# WEATHER GRID (struct of arrays)
+# ============================================================================
+
+@dataclass
+class WeatherGrid:
+    """
+    Current conditions (shape N) and hourly series (shape N x H) for N locations
+    """
+    temperature: np.ndarray
+    humidity: np.ndarray
+    precipitation: np.ndarray
+    windspeed: np.ndarray
+    stormy: np.ndarray
+    hourly_temperature: np.ndarray
+    hourly_humidity: np.ndarray
+    hourly_precipitation: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.temperature)
+
+    @classmethod
+    def from_weather(cls, snapshots: Sequence[Dict[str, Any]], hours: int = 24) -> "WeatherGrid":
+        """
+        Builds a grid from weather dicts as returned by fetch_real_weather.
+        Hourly series start at each snapshot's current hour (as build_smart_guidance's
+        do); windows shorter than `hours` are padded with NaN.
+        """
+        n = len(snapshots)
+        hourly = {key: np.full((n, hours), np.nan) for key in ('temperature_2m', 'relative_humidity_2m', 'precipitation')}
+        for i, weather in enumerate(snapshots):
+            window = time_axis(weather).window(hours)
+            for key, matrix in hourly.items():
+                values = weather['hourly'][key][window]
+                matrix[i, :len(values)] = np.asarray(values, dtype=np.float64)
+
+        return cls(
+            temperature=np.array([w['temperature'] for w in snapshots], dtype=np.float64),
+            humidity=np.array([w['humidity'] for w in snapshots], dtype=np.float64),
+            precipitation=np.array([w['precipitation'] or 0 for w in snapshots], dtype=np.float64),
+            windspeed=np.array([w['windspeed'] for w in snapshots], dtype=np.float64),
+            stormy=np.array(["Storm" in w.get('condition', '') for w in snapshots], dtype=bool),
+            hourly_temperature=hourly['temperature_2m'],
+            hourly_humidity=hourly['relative_humidity_2m'],
+            hourly_precipitation=hourly['precipitation'],
+        )
+
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+@dataclass
+class BulkResult:
+    """
+    Signals and decisions for every location, one compact array per field
+
+    signals: bool matrix (N x len(SIGNAL_TYPES))
+    codes: decision name -> int8 indexes into labels[decision name]
+    unsafe_hours: bool matrix (N x H) of hours with heat index >= unsafe_heat_index
+    """
+    names: List[str]
+    heat_index: np.ndarray
+    signals: np.ndarray
+    codes: Dict[str, np.ndarray]
+    unsafe_hours: np.ndarray
+    next_6h_risky: np.ndarray
+    study_comfort_good: np.ndarray
+    labels: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def nbytes(self) -> int:
+        arrays = [self.heat_index, self.signals, self.unsafe_hours, self.next_6h_risky, self.study_comfort_good]
+        return sum(a.nbytes for a in arrays) + sum(c.nbytes for c in self.codes.values())
+
+    def label(self, decision: str, i: int) -> str:
+        return self.labels[decision][self.codes[decision][i]]
+
+    def signal_types(self, i: int) -> List[str]:
+        return [SIGNAL_TYPES[j] for j in np.flatnonzero(self.signals[i])]
+
+    def to_dict(self, i: int, mode: str = "general") -> Dict[str, Any]:
+        """Decodes one location into the key fields of get_smart_guidance(mode)"""
+        decision: Dict[str, Any] = {"confidence": self.label("forecast_confidence", i)}
+        if mode == "worker":
+            decision["status"] = self.label("work_safety_status", i)
+            decision["unsafe_hour_count"] = int(self.unsafe_hours[i].sum())
+        elif mode == "farmer":
+            decision["risk_level"] = self.label("crop_risk", i)
+            decision["spraying_suitable"] = self.label("spraying_suitability", i)
+        else:
+            decision["key_tip"] = self.label("todays_key_tip", i)
+            decision["next_6h_risk"] = "RISKY" if self.next_6h_risky[i] else "SAFE"
+            if mode == "student":
+                decision["study_comfort"] = "GOOD" if self.study_comfort_good[i] else "POOR"
+        return {
+            "name": self.names[i],
+            "mode": mode,
+            "signals": self.signal_types(i),
+            "decision": decision,
+        }
+
+
+# ============================================================================
+# EVALUATION
+# ============================================================================
+
+def evaluate(
+    table: LocationTable,
+    grid: WeatherGrid,
+    rules: RuleSet,
+    flood_prone: Optional[np.ndarray] = None,
+) -> BulkResult:
+    """
+    Evaluates signals and all guidance modes for every location at once
+
+    Args:
+        rules: compiled rule table (thresholds and decisions)
+        flood_prone: bool mask of locations subject to the flood rule; defaults
+            to names containing "Sylhet" (same rule as get_signals)
+    """
+    if flood_prone is None:
+        flood_prone = np.array(["Sylhet" in name for name in table.names], dtype=bool)
+
+    heat_index = grid.temperature + grid.humidity / 10
+    stormy = grid.stormy
+    thresholds = rules.thresholds
+
+    # --- Engine A: weather signals ---
+    signals = np.column_stack([
+        grid.precipitation >= thresholds["heavy_rain"],
+        (grid.precipitation > thresholds["flood_rain"]) & flood_prone,
+        grid.windspeed >= thresholds["cyclone_wind"],
+        heat_index >= thresholds["heat_stress"],
+        stormy,
+    ])
+
+    # --- Rule table inputs (WeatherInput fields as arrays) ---
+    first_6h = grid.hourly_temperature[:, :6]
+    with np.errstate(invalid="ignore"):
+        spread = np.nan_to_num(np.nanmax(first_6h, axis=1) - np.nanmin(first_6h, axis=1))
+    inputs = {
+        "temperature": grid.temperature,
+        "humidity": grid.humidity,
+        "rain_probability": np.minimum(grid.precipitation / 10, 1.0),
+        "wind_speed": grid.windspeed,
+        "heat_index": heat_index,
+        "lightning_risk": np.where(stormy, 0.8, 0.1),
+        "forecast_stability": np.minimum(spread / 10, 1.0),
+    }
+    labels = {name: rules.decisions[name].outcomes for name in DECISIONS}
+    codes = {name: rules.decisions[name].select(inputs, labels[name]) for name in DECISIONS}
+
+    # --- Hourly checks (worker unsafe hours, general/student next 6h) ---
+    hourly_heat_index = grid.hourly_temperature + grid.hourly_humidity / 10
+    unsafe_hours = hourly_heat_index >= thresholds["unsafe_heat_index"]  # NaN padding compares False
+    hourly_rain_probability = np.minimum(grid.hourly_precipitation[:, :6] / 10, 1.0)
+    next_6h_risky = (hourly_rain_probability > thresholds["rain_risk"]).any(axis=1)
+
+    return BulkResult(
+        names=table.names,
+        heat_index=heat_index.astype(np.float32),
+        signals=signals,
+        codes=codes,
+        unsafe_hours=unsafe_hours,
+        next_6h_risky=next_6h_risky,
+        study_comfort_good=heat_index < thresholds["study_heat_index"],
+        labels=labels,
+    )
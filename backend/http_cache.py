@@ -0,0 +1,77 @@
+"""
+HTTP Caching Helpers
+Content-hash ETags, If-None-Match -> 304 handling and Cache-Control headers
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from json_codec import dumps
+from metrics import timed
+
+
+@timed("encode")
+def encode_json(payload: Any) -> bytes:
+    """Compact UTF-8 JSON, same encoding as the app's default response class"""
+    return dumps(payload)
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison as required for If-None-Match (RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+def with_fields(body: bytes, fields: Dict[str, Any]) -> bytes:
+    """Splices extra top-level fields into an encoded JSON object without re-encoding it"""
+    extra = encode_json(fields)
+    if body.rstrip() == b"{}":
+        return extra
+    return body.rstrip()[:-1] + b"," + extra[1:]
+
+
+def cache_control(max_age: float) -> str:
+    return f"public, max-age={max(int(max_age), 0)}"
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    max_age: float,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    JSON response with validators; 304 Not Modified when the client's copy is current
+
+    extra: per-request fields (e.g. data_age_seconds) spliced into the body.
+    They don't take part in the ETag, which is then marked weak.
+    """
+    etag = etag or etag_for(body)
+    if extra:
+        body = with_fields(body, extra)
+        if not etag.startswith("W/"):
+            etag = "W/" + etag
+    headers = {"ETag": etag, "Cache-Control": cache_control(max_age)}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def json_response(request: Request, payload: Any, max_age: float, extra: Optional[Dict[str, Any]] = None) -> Response:
+    return conditional_response(request, encode_json(payload), max_age, extra=extra)
@@ -0,0 +1,105 @@
+"""
+Incremental Signal Evaluation
+Per-location input fingerprints, memoized evaluations and a changed-locations feed
+
+A refresh usually brings the same current conditions for most locations.
+Signals and insights depend only on the fingerprinted fields, so an unchanged
+fingerprint reuses the previous evaluation and the location is left out of
+the change feed; downstream caches and push channels subscribe to that feed
+instead of reacting to every snapshot.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+INPUT_FIELDS = ("precipitation", "windspeed", "temperature", "humidity", "condition")
+
+
+def fingerprint(weather: Dict[str, Any]) -> Tuple:
+    return tuple(weather.get(field) for field in INPUT_FIELDS)
+
+
+class IncrementalEvaluator:
+    """
+    evaluate(weather, name) is only called when the location's fingerprint
+    changed or its last evaluation is older than max_age (time-relative
+    output such as valid_until stays current)
+
+    Listeners receive the sorted list of locations that changed; changes seen
+    within one event-loop iteration (a refresh batch) arrive as one call.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[Dict[str, Any], str], Any],
+        max_age: float = 3 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.evaluate = evaluate
+        self.max_age = max_age
+        self.clock = clock
+        self._entries: Dict[Hashable, Tuple[Tuple, Any, float]] = {}
+        self._listeners: List[Callable[[List[Hashable]], None]] = []
+        self._pending: set = set()
+        self._flush_scheduled = False
+        self.evaluations = 0
+        self.skipped = 0
+
+    def subscribe(self, listener: Callable[[List[Hashable]], None]) -> None:
+        self._listeners.append(listener)
+
+    def update(self, name: Hashable, weather: Dict[str, Any]) -> bool:
+        """
+        Re-evaluates name if needed; True if it was re-evaluated. Only a changed
+        fingerprint (not an expired evaluation) produces a change event.
+        """
+        key = fingerprint(weather)
+        entry = self._entries.get(name)
+        now = self.clock()
+        if entry is not None and entry[0] == key and now - entry[2] < self.max_age:
+            self.skipped += 1
+            return False
+        self._entries[name] = (key, self.evaluate(weather, name), now)
+        self.evaluations += 1
+        if entry is None or entry[0] != key:
+            self._notify(name)
+        return True
+
+    def clear(self) -> None:
+        """Forgets every evaluation, e.g. after the rules changed; next updates count as changes"""
+        self._entries.clear()
+
+    def peek(self, name: Hashable) -> Optional[Any]:
+        entry = self._entries.get(name)
+        return None if entry is None else entry[1]
+
+    def get(self, name: Hashable, weather: Dict[str, Any]) -> Any:
+        """Evaluation for the snapshot the caller holds, computed on demand (or when expired)"""
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != fingerprint(weather) or self.clock() - entry[2] >= self.max_age:
+            self.update(name, weather)
+            entry = self._entries[name]
+        return entry[1]
+
+    def _notify(self, name: Hashable) -> None:
+        self._pending.add(name)
+        if self._flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush()
+            return
+        self._flush_scheduled = True
+        loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        names, self._pending = sorted(self._pending), set()
+        if names:
+            for listener in self._listeners:
+                listener(names)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"locations": len(self._entries), "evaluations": self.evaluations, "skipped": self.skipped}
@@ -0,0 +1,40 @@
+"""
+JSON Codec
+One bytes-in / bytes-out JSON path for upstream payloads, stored snapshots and
+API responses: orjson when installed, the standard library otherwise
+
+Both backends produce compact UTF-8 without ASCII escaping, so bodies and
+ETags keep the same shape whichever is active.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, see requirements.txt
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+else:
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(data: bytes) -> Any:
+        return json.loads(data)  # accepts bytes directly, no .decode() round trip
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: renders through dumps()"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
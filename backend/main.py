@@ -1,12 +1,65 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-import urllib.request
-import json
-import random
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from urllib.parse import parse_qs
+import asyncio
+import hmac
+import math
+import os
 import datetime
+import tempfile
+import time
 from typing import List, Optional
 
-app = FastAPI()
+from alert_stream import AlertBroadcaster
+from bulk_engine import load_locations
+from http_cache import conditional_response, encode_json, json_response
+from incremental import IncrementalEvaluator
+from json_codec import FastJSONResponse
+from metrics import RequestMetrics, registry, stage, timed
+from news_store import NATIONAL, Article, Classifier, NewsIngester
+from phase1_rules import rule_engine
+from prefetch import DivisionRefresher
+from profiler import SamplingProfiler
+from projection import parse_fields, project
+from resilience import CircuitBreaker, CircuitOpenError, RateLimitedError, ResilientUpstream, TokenBucket
+from response_store import ResponseStore
+from shared_state import SharedWeatherState
+from snapshot_store import SnapshotStore
+from spatial_index import NearestLocationIndex
+from time_axis import TimeAxis, time_axis
+from trend_engine import TrendCache, compute_trends
+from upstream import UpstreamClient
+from weather_cache import LoadShedError, WeatherCache
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global shared_sync_task
+    restore_snapshots()
+    rules_watch_task = asyncio.create_task(watch_rules()) if RULES_POLL > 0 else None
+    await asyncio.to_thread(news_ingester.reload_if_changed)
+    news_watch_task = asyncio.create_task(watch_news()) if NEWS_POLL > 0 else None
+    if shared_state is None or shared_state.try_become_writer():
+        publish_cached()
+        if PREFETCH_ENABLED:
+            refresher.start()
+    else:
+        shared_sync_task = asyncio.create_task(sync_shared_state())
+    yield
+    if rules_watch_task is not None:
+        rules_watch_task.cancel()
+    if news_watch_task is not None:
+        news_watch_task.cancel()
+    if shared_sync_task is not None:
+        shared_sync_task.cancel()
+        shared_sync_task = None
+    await refresher.stop()
+    await upstream.aclose()
+    await asyncio.to_thread(snapshot_store.flush)
+    profiler.stop()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Allow CORS for local development
 app.add_middleware(
@@ -21,11 +74,78 @@ app.add_middleware(
 
 TRUSTED_SOURCES = ["BMD", "The Daily Star", "Prothom Alo", "The Daily Naya Diganta", "FFWC"]
 
-# Thresholds for Weather Signal Engine (PART 1.A)
-HEAVY_RAIN_THRESHOLD = 10.0  # mm/h
-CYCLONE_WIND_THRESHOLD = 50.0  # km/h
-HEAT_STRESS_THRESHOLD = 40.0 # Heat Index
-LIGHTNING_THRESHOLD = 30.0 # Percentage probability
+# Thresholds for Weather Signal Engine (PART 1.A) and the guidance decisions live in
+# the rule table (RULES_FILE, default data/rules.json); edits are picked up every RULES_POLL seconds
+RULES_POLL = float(os.environ.get("RULES_POLL", 5))  # 0 disables hot reload
+
+# Weather cache (seconds). Open-Meteo updates hourly, so serving slightly stale data is fine
+WEATHER_CACHE_TTL = float(os.environ.get("WEATHER_CACHE_TTL", 600))
+WEATHER_CACHE_STALE_TTL = float(os.environ.get("WEATHER_CACHE_STALE_TTL", 3600))
+
+# Upstream HTTP client
+OPEN_METEO_URL = os.environ.get("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+UPSTREAM_TIMEOUT = float(os.environ.get("UPSTREAM_TIMEOUT", 10))  # seconds
+UPSTREAM_MAX_CONNECTIONS = int(os.environ.get("UPSTREAM_MAX_CONNECTIONS", 20))
+UPSTREAM_MAX_CONCURRENCY = int(os.environ.get("UPSTREAM_MAX_CONCURRENCY", 16))
+UPSTREAM_DEADLINE = float(os.environ.get("UPSTREAM_DEADLINE", 15))  # seconds, whole call incl. hedge
+UPSTREAM_HEDGE_AFTER = float(os.environ.get("UPSTREAM_HEDGE_AFTER", 0))  # seconds, 0 disables hedging
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get("CIRCUIT_RESET_TIMEOUT", 30))  # seconds
+UPSTREAM_BATCH_SIZE = int(os.environ.get("UPSTREAM_BATCH_SIZE", 100))  # points per multi-location call
+
+# Global upstream rate limit in locations per second (a batch costs one token per location).
+# Open-Meteo's free tier allows 600 calls/minute; the default keeps to half of that.
+# Fetches that would wait longer than UPSTREAM_RATE_MAX_WAIT are shed: requests get the
+# last snapshot held, however old (marked degraded), or 503 if there is none
+UPSTREAM_RATE = float(os.environ.get("UPSTREAM_RATE", 5))  # 0 disables the limit
+UPSTREAM_RATE_BURST = float(os.environ.get("UPSTREAM_RATE_BURST", 100))
+UPSTREAM_RATE_MAX_WAIT = float(os.environ.get("UPSTREAM_RATE_MAX_WAIT", 2))  # seconds
+
+# Background prefetch of all divisions (seconds). Open-Meteo updates hourly,
+# new runs are usually published a few minutes past the hour
+PREFETCH_ENABLED = os.environ.get("PREFETCH_ENABLED", "1") == "1"
+PREFETCH_INTERVAL = float(os.environ.get("PREFETCH_INTERVAL", 3600))
+PREFETCH_OFFSET = float(os.environ.get("PREFETCH_OFFSET", 300))
+PREFETCH_MAX_RETRIES = int(os.environ.get("PREFETCH_MAX_RETRIES", 3))
+
+# On-disk snapshot history (warm restarts + day-over-day comparisons)
+SNAPSHOT_DB = os.environ.get("SNAPSHOT_DB", os.path.join(os.path.dirname(__file__), "data", "snapshots.db"))
+SNAPSHOT_RETENTION_DAYS = float(os.environ.get("SNAPSHOT_RETENTION_DAYS", 7))
+
+# Cross-worker shared state: one worker refreshes, the others read the mmap ("" disables)
+SHARED_STATE_PATH = os.environ.get(
+    "SHARED_STATE_PATH",
+    os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "bd-weather-state"),
+)
+SHARED_STATE_POLL = float(os.environ.get("SHARED_STATE_POLL", 2))  # seconds
+# Reader workers with prefetch on: how long a cold miss waits for the writer to
+# publish the location before fetching upstream itself (seconds, 0 = never wait)
+SHARED_STATE_WAIT = float(os.environ.get("SHARED_STATE_WAIT", 5))
+
+# Alert push (SSE): comment keep-alive interval and per-client pending-event buffer
+ALERT_STREAM_KEEPALIVE = float(os.environ.get("ALERT_STREAM_KEEPALIVE", 15))  # seconds
+ALERT_STREAM_QUEUE = int(os.environ.get("ALERT_STREAM_QUEUE", 8))
+
+# Unchanged inputs reuse a location's last evaluation for up to this long (< the 6h alert validity)
+EVALUATION_MAX_AGE = int(os.environ.get("EVALUATION_MAX_AGE", 3 * 3600))  # seconds
+
+# Sampling profiler endpoints (/api/v1/profiler*) need this token in X-Profiler-Token ("" disables them)
+PROFILER_TOKEN = os.environ.get("PROFILER_TOKEN", "")
+PROFILER_INTERVAL = float(os.environ.get("PROFILER_INTERVAL", 0.005))  # seconds between samples
+
+# News feeds: RSS, JSON Feed and JSON Lines files in NEWS_FEED_DIR, re-ingested when a file changes
+NEWS_FEED_DIR = os.environ.get("NEWS_FEED_DIR", os.path.join(os.path.dirname(__file__), "data", "news"))
+NEWS_POLL = float(os.environ.get("NEWS_POLL", 60))  # seconds, 0 loads once at startup
+NEWS_MAX_ARTICLES = int(os.environ.get("NEWS_MAX_ARTICLES", 10000))  # newest kept
+NEWS_PAGE_SIZE = int(os.environ.get("NEWS_PAGE_SIZE", 20))
+
+# Client/CDN caching (seconds)
+NEWS_MAX_AGE = int(os.environ.get("NEWS_MAX_AGE", 300))
+
+USER_MODES = ["general", "student", "farmer", "worker"]
+
+# Raw series left out of current_weather unless a client asks for them via ?fields=
+BULKY_WEATHER_FIELDS = ("hourly", "daily")
 
 DIVISION_COORDS = {
     'Dhaka': {'lat': 23.8103, 'lng': 90.4125},
@@ -38,6 +158,13 @@ DIVISION_COORDS = {
     'Mymensingh': {'lat': 24.7471, 'lng': 90.4203},
 }
 
+# Every location we keep warm and can snap GPS coordinates to (district HQs, incl. the divisions above)
+LOCATIONS = load_locations(os.environ.get("LOCATIONS_FILE", os.path.join(os.path.dirname(__file__), "data", "districts.csv")))
+LOCATION_COORDS = {**LOCATIONS.as_points(), **DIVISION_COORDS}
+LOCATION_DIVISIONS = dict(zip(LOCATIONS.names, LOCATIONS.divisions))
+LOCATION_BY_KEY = {(c['lat'], c['lng']): name for name, c in LOCATION_COORDS.items()}  # cache key -> location
+SNAP_MAX_DISTANCE_KM = float(os.environ.get("SNAP_MAX_DISTANCE_KM", 100))
+
 def map_weather_code(code: int) -> str:
     if code == 0: return "Clear"
     if code in [1, 2, 3]: return "Cloudy"
@@ -49,21 +176,22 @@ def map_weather_code(code: int) -> str:
 
 # --- ENGINE A: WEATHER SIGNAL ENGINE ---
 
-def get_signals(weather, lat, lng):
+@timed("signals")
+def get_signals(weather, lat, lng, district: str):
     signals = []
     
     # Rainfall Check
     rainfall = weather.get('precipitation', 0)
-    if rainfall >= HEAVY_RAIN_THRESHOLD:
+    if rainfall >= rule_engine.threshold('heavy_rain'):
         signals.append({"type": "heavy_rain", "severity": "high", "val": rainfall})
     
     # Flood Risk (Mocked context: continuous rain + low-lying)
-    if rainfall > 5.0 and "Sylhet" in weather.get('district', ''):
+    if rainfall > rule_engine.threshold('flood_rain') and "Sylhet" in district:
          signals.append({"type": "flood_risk", "severity": "emergency", "val": rainfall})
 
     # Cyclone Check
     wind = weather.get('windspeed', 0)
-    if wind >= CYCLONE_WIND_THRESHOLD:
+    if wind >= rule_engine.threshold('cyclone_wind'):
          signals.append({"type": "cyclone", "severity": "emergency", "val": wind})
 
     # Heat Stress Check
@@ -71,7 +199,7 @@ def get_signals(weather, lat, lng):
     humid = weather.get('humidity', 50)
     # Simple Heat Index proxy: Temp + (Humidity/10)
     heat_index = temp + (humid / 10)
-    if heat_index >= HEAT_STRESS_THRESHOLD:
+    if heat_index >= rule_engine.threshold('heat_stress'):
          signals.append({"type": "heat_stress", "severity": "high", "val": heat_index})
 
     # Lightning Probability (Mocked)
@@ -82,35 +210,304 @@ def get_signals(weather, lat, lng):
 
 # --- FETCHING ---
 
-def fetch_real_weather(lat: float, lng: float, district: str = "Dhaka"):
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lng}&current_weather=true&hourly=temperature_2m,relative_humidity_2m,precipitation,weathercode&daily=temperature_2m_max,temperature_2m_min&timezone=auto"
+upstream = UpstreamClient(
+    timeout=UPSTREAM_TIMEOUT,
+    max_connections=UPSTREAM_MAX_CONNECTIONS,
+    max_concurrency=UPSTREAM_MAX_CONCURRENCY,
+)
+
+upstream_limiter = TokenBucket(UPSTREAM_RATE, UPSTREAM_RATE_BURST) if UPSTREAM_RATE > 0 else None
+
+resilient_upstream = ResilientUpstream(
+    upstream,
+    CircuitBreaker(failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT),
+    deadline=UPSTREAM_DEADLINE,
+    hedge_after=UPSTREAM_HEDGE_AFTER or None,
+    limiter=upstream_limiter,
+    max_wait=UPSTREAM_RATE_MAX_WAIT,
+)
+
+@timed("parse")
+def parse_weather(data):
+    """
+    Flattens one Open-Meteo forecast payload into our weather dict
+    Snapshots are cached per coordinates and shared by every name that resolves to them,
+    so they carry no district; responses add the requested one.
+    """
+    current = data['current_weather']
+    hourly = data['hourly']
+    
+    current_time = current['time']
+    axis = TimeAxis(hourly['time'], data.get('utc_offset_seconds', 0))
+    time_idx = axis.index_of(current_time)
+    if time_idx is None:
+        time_idx = axis.current_index()
+    humidity = hourly['relative_humidity_2m'][time_idx] if time_idx < len(hourly['relative_humidity_2m']) else 50
+    precipitation = hourly['precipitation'][time_idx] if time_idx < len(hourly['precipitation']) else 0
+    
+    return {
+        "time": current_time,
+        "temperature": current['temperature'],
+        "condition": map_weather_code(current['weathercode']),
+        "humidity": humidity,
+        "precipitation": precipitation,
+        "windspeed": current['windspeed'],
+        "utc_offset_seconds": data.get('utc_offset_seconds', 0),
+        "hourly": data['hourly'],
+        "daily": data['daily']
+    }
+
+def forecast_params(lats, lngs):
+    """Open-Meteo query for one or many points (comma-separated coordinate lists)"""
+    return {
+        "latitude": ",".join(str(lat) for lat in lats),
+        "longitude": ",".join(str(lng) for lng in lngs),
+        "current_weather": "true",
+        "hourly": "temperature_2m,relative_humidity_2m,precipitation,weathercode",
+        "daily": "temperature_2m_max,temperature_2m_min",
+        "timezone": "auto",
+    }
+
+async def fetch_forecast(kind: str, lats, lngs):
+    """One Open-Meteo call (kind: "single" or "batch"), counted and timed for /metrics"""
     try:
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
-            current = data['current_weather']
-            hourly = data['hourly']
-            
-            current_time = current['time']
-            time_idx = hourly['time'].index(current_time) if current_time in hourly['time'] else 0
-            humidity = hourly['relative_humidity_2m'][time_idx] if time_idx < len(hourly['relative_humidity_2m']) else 50
-            precipitation = hourly['precipitation'][time_idx] if time_idx < len(hourly['precipitation']) else 0
-            
-            return {
-                "district": district,
-                "temperature": current['temperature'],
-                "condition": map_weather_code(current['weathercode']),
-                "humidity": humidity,
-                "precipitation": precipitation,
-                "windspeed": current['windspeed'],
-                "hourly": data['hourly'],
-                "daily": data['daily']
-            }
+        with stage("upstream_fetch"):
+            data = await resilient_upstream.get_json(OPEN_METEO_URL, params=forecast_params(lats, lngs), cost=len(lats))
+    except Exception as e:
+        UPSTREAM_CALLS.inc(kind, "error")
+        UPSTREAM_ERRORS.inc(kind, type(e).__name__)
+        raise
+    UPSTREAM_CALLS.inc(kind, "ok")
+    UPSTREAM_POINTS.inc(amount=len(lats))
+    return data
+
+async def fetch_real_weather(lat: float, lng: float):
+    """
+    Raises LoadShedError when the call was refused (rate limit, open circuit) rather
+    than attempted, so the cache serves what it holds or the request gets a 503
+    """
+    try:
+        data = await fetch_forecast("single", [lat], [lng])
+        return parse_weather(data)
+    except (RateLimitedError, CircuitOpenError) as e:
+        raise LoadShedError(shed_retry_after()) from e
     except Exception as e:
         print(f"Error fetching weather: {e}")
         return None
 
+async def fetch_weather_batch(points=None):
+    """
+    Fetches many locations in as few upstream calls as possible
+    
+    Args:
+        points: {name: {'lat': .., 'lng': ..}}, defaults to DIVISION_COORDS
+    
+    Returns:
+        {name: weather dict (same shape as fetch_real_weather) or None on failure}
+    """
+    points = DIVISION_COORDS if points is None else points
+    names = list(points)
+    chunks = [names[i:i + UPSTREAM_BATCH_SIZE] for i in range(0, len(names), UPSTREAM_BATCH_SIZE)]
+    results = await asyncio.gather(*(_fetch_weather_chunk(chunk, points) for chunk in chunks))
+    merged = {}
+    for chunk_result in results:
+        merged.update(chunk_result)
+    return merged
+
+async def _fetch_weather_chunk(names, points):
+    try:
+        data = await fetch_forecast("batch", [points[n]['lat'] for n in names], [points[n]['lng'] for n in names])
+        # A single point comes back as an object, several as a list in request order
+        payloads = data if isinstance(data, list) else [data]
+        return {name: parse_weather(payload) for name, payload in zip(names, payloads)}
+    except (RateLimitedError, CircuitOpenError):
+        # Refused rather than attempted: shed, counted like single-location fetches
+        weather_cache.shed += len(names)
+        return {name: None for name in names}
+    except Exception as e:
+        print(f"Error fetching weather batch: {e}")
+        return {name: None for name in names}
+
+def shed_retry_after() -> float:
+    """Retry-After for shed requests: until the circuit may close or a token is available"""
+    if resilient_upstream.breaker.state == "open":
+        return CIRCUIT_RESET_TIMEOUT
+    return upstream_limiter.wait_time() if upstream_limiter is not None else 1.0
+
+weather_cache = WeatherCache(fetch_real_weather, ttl=WEATHER_CACHE_TTL, stale_ttl=WEATHER_CACHE_STALE_TTL)
+DEGRADED_AFTER = WEATHER_CACHE_TTL + WEATHER_CACHE_STALE_TTL
+
+refresher = DivisionRefresher(
+    fetch_weather_batch,
+    LOCATION_COORDS,
+    weather_cache,
+    interval=PREFETCH_INTERVAL,
+    offset=PREFETCH_OFFSET,
+    max_retries=PREFETCH_MAX_RETRIES,
+)
+
+snapshot_store = SnapshotStore(SNAPSHOT_DB, retention_days=SNAPSHOT_RETENTION_DAYS)
+
+shared_state = SharedWeatherState(SHARED_STATE_PATH, list(LOCATION_COORDS)) if SHARED_STATE_PATH else None
+shared_sync_task = None
+
+def owns_upstream() -> bool:
+    """True in the worker that fetches and persists weather (the only worker without shared state)"""
+    return shared_state is None or shared_state.is_writer
+
+def publish_shared(key, weather):
+    """Cache listener (writer worker): mirrors new snapshots into shared memory"""
+    if shared_state is not None and shared_state.is_writer:
+        shared_state.write(LOCATION_BY_KEY.get(key), weather, fetched_at=time.time() - (weather_cache.age(key) or 0))
+
+weather_cache.subscribe(publish_shared)
+
+def publish_cached():
+    """Writer worker start: publishes the snapshots restored from disk, so readers start warm"""
+    for key in LOCATION_BY_KEY:
+        entry = weather_cache.peek(key)
+        if entry is not None:
+            publish_shared(key, entry.value)
+
+async def await_shared(keys):
+    """
+    Reader workers: on a cold miss, waits up to SHARED_STATE_WAIT for the writer
+    to publish the missing locations (imported into the cache as they appear)
+    instead of every worker fetching them upstream itself
+    """
+    if not PREFETCH_ENABLED or shared_sync_task is None or shared_sync_task.done():
+        return
+    pending = [key for key in keys if key in LOCATION_BY_KEY]
+    deadline = time.monotonic() + SHARED_STATE_WAIT
+    while pending:
+        if shared_state.attach():
+            for key in pending:
+                hit = shared_state.read(LOCATION_BY_KEY[key])
+                if hit is not None:
+                    weather, fetched_at = hit
+                    weather_cache.put(key, weather, age=max(time.time() - fetched_at, 0))
+            pending = [key for key in pending if weather_cache.peek(key) is None]
+        if not pending or time.monotonic() >= deadline:
+            return
+        await asyncio.sleep(0.1)
+
+async def sync_shared_state():
+    """Reader workers: imports every location the writer has refreshed since the last poll"""
+    while True:
+        if shared_state.attach():
+            for name in shared_state.changed():
+                hit = shared_state.read(name)
+                if hit is not None:
+                    weather, fetched_at = hit
+                    coords = LOCATION_COORDS[name]
+                    weather_cache.put((coords['lat'], coords['lng']), weather, age=max(time.time() - fetched_at, 0))
+        await asyncio.sleep(SHARED_STATE_POLL)
+
+def prefetch_active() -> bool:
+    """True when a refresher (in this worker or the writer worker) keeps locations warm"""
+    return refresher.running or (shared_sync_task is not None and not shared_sync_task.done())
+
+def persist_snapshot(key, weather):
+    """Cache listener: queues every new snapshot for the on-disk history (written off the event loop)"""
+    if not owns_upstream():
+        return
+    snapshot_store.save_later(key, weather, fetched_at=time.time() - (weather_cache.age(key) or 0), location=LOCATION_BY_KEY.get(key, ""))
+
+weather_cache.subscribe(persist_snapshot)
+
+def restore_snapshots():
+    """Loads the latest snapshot per location from disk so a fresh worker starts warm"""
+    now = time.time()
+    for key, weather, fetched_at in snapshot_store.load_latest():
+        weather.pop('district', None)  # snapshots recorded before snapshots stopped carrying a name
+        if weather_cache.peek(key) is None:
+            weather_cache.put(key, weather, age=max(now - fetched_at, 0))
+
+location_index = NearestLocationIndex(LOCATIONS, max_distance_km=SNAP_MAX_DISTANCE_KM)
+
+def resolve_location(district: str, lat: Optional[float] = None, lng: Optional[float] = None):
+    """
+    Maps request parameters to (district name, coords)
+    
+    lat/lng snap to the nearest known location so arbitrary GPS positions share
+    its cached weather; otherwise (or when nothing is near) the district name
+    is looked up, falling back to Dhaka's coordinates.
+    """
+    if lat is not None and lng is not None:
+        hit = location_index.nearest(lat, lng)
+        if hit is not None:
+            name = LOCATIONS.names[hit[0]]
+            return name, LOCATION_COORDS[name]
+    return district, LOCATION_COORDS.get(district, DIVISION_COORDS['Dhaka'])
+
+async def get_cached_weather(coords):
+    """
+    Cached fetch_real_weather, keyed by (lat, lng)
+    Locations kept warm by the refresher are served as-is, whatever their age;
+    a reader worker waits for the writer's snapshot before fetching itself
+    """
+    key = (coords['lat'], coords['lng'])
+    if prefetch_active():
+        entry = weather_cache.peek(key)
+        if entry is None:
+            await await_shared([key])
+            entry = weather_cache.peek(key)
+        if entry is not None:
+            PREFETCHED_READS.inc()
+            return entry.value
+    return await weather_cache.get(key, coords['lat'], coords['lng'])
+
+async def get_cached_weather_many(names):
+    """
+    Snapshots for many known locations, with get_cached_weather's semantics:
+    locations needing a fetch are refreshed together in one batched upstream
+    call, sharing fetches already in flight for any of them
+    Returns {name: weather}; locations shed or failing with nothing cached are left out.
+    """
+    keys = {}
+    for name in names:
+        coords = LOCATION_COORDS[name]
+        keys.setdefault((coords['lat'], coords['lng']), []).append(name)
+
+    snapshots = {}
+    if prefetch_active():
+        await await_shared([key for key in keys if weather_cache.peek(key) is None])
+        for key in list(keys):
+            entry = weather_cache.peek(key)
+            if entry is not None:
+                PREFETCHED_READS.inc()
+                for name in keys.pop(key):
+                    snapshots[name] = entry.value
+
+    async def load_batch(batch_keys):
+        fetched = await fetch_weather_batch({keys[key][0]: {'lat': key[0], 'lng': key[1]} for key in batch_keys})
+        return {key: fetched.get(keys[key][0]) for key in batch_keys}
+
+    for key, weather in (await weather_cache.get_many(keys, load_batch)).items():
+        for name in keys[key]:
+            snapshots[name] = weather
+    return snapshots
+
+def data_age(coords):
+    """
+    Per-request freshness field added to every weather-backed response, plus
+    degraded=true when the snapshot is older than the cache would normally
+    serve (upstream failing or fetches shed under load)
+    """
+    age = weather_cache.age((coords['lat'], coords['lng'])) or 0
+    if age > DEGRADED_AFTER:
+        return {"data_age_seconds": int(age), "degraded": True}
+    return {"data_age_seconds": int(age)}
+
+def snapshot_max_age(coords) -> float:
+    """Cache-Control max-age: remaining lifetime of the weather snapshot behind a response"""
+    age = weather_cache.age((coords['lat'], coords['lng'])) or 0
+    lifetime = PREFETCH_INTERVAL if prefetch_active() else WEATHER_CACHE_TTL
+    return max(lifetime - age, 0)
+
 # --- ENGINE C: INSIGHT GENERATION ENGINE ---
 
+@timed("insights")
 def generate_insights(signals, user_mode, district):
     insights = []
     
@@ -181,44 +578,58 @@ def generate_insights(signals, user_mode, district):
     insights.sort(key=rank_score, reverse=True)
     return insights[:3] # LIMIT visible_insights TO 3
 
-# --- API ENDPOINTS ---
+# --- INCREMENTAL EVALUATION ---
+# Signals, ranked insights and alerts depend only on a location's current
+# conditions; they are recomputed when those change, not on every snapshot.
 
-@app.get("/")
-def read_root():
-    return {"message": "Bangladesh Weather Intelligence API", "version": "v1.2 (Blueprint Aligned)"}
-
-@app.get("/api/v1/insights/home")
-def get_home_insights(district: str = "Dhaka", mode: str = "general"):
-    coords = DIVISION_COORDS.get(district, DIVISION_COORDS['Dhaka'])
-    weather = fetch_real_weather(coords['lat'], coords['lng'], district)
-    
-    if not weather:
-        return {"error": "Weather data unavailable"}
-    
-    signals = get_signals(weather, coords['lat'], coords['lng'])
+def evaluate_mode(weather, district: str, mode: str, signals=None):
+    """(signals, ranked insights, alerts payload) for one location and mode"""
+    if signals is None:
+        coords = LOCATION_COORDS.get(district, DIVISION_COORDS['Dhaka'])
+        signals = get_signals(weather, coords['lat'], coords['lng'], district)
     insights = generate_insights(signals, mode, district)
+    return signals, insights, alerts_from_insights(insights)
+
+def evaluate_location(weather, district: str):
+    coords = LOCATION_COORDS[district]
+    signals = get_signals(weather, coords['lat'], coords['lng'], district)
+    return {mode: evaluate_mode(weather, district, mode, signals) for mode in USER_MODES}
+
+evaluator = IncrementalEvaluator(evaluate_location, EVALUATION_MAX_AGE)
+
+def location_evaluation(weather, district: str, mode: str):
+    if district in LOCATION_COORDS and mode in USER_MODES:
+        return evaluator.get(district, weather)[mode]
+    return evaluate_mode(weather, district, mode)
+
+# --- RESPONSE BUILDERS ---
+# Pure functions of (weather snapshot, district, mode). Division snapshots are
+# materialized through these for every mode as soon as they arrive.
+
+def build_home_insights(weather, district: str, mode: str, expand: bool = False):
+    """
+    expand=False (the default, and what gets materialized) drops the raw
+    hourly/daily series from current_weather
+    """
+    signals, insights, _ = location_evaluation(weather, district, mode)
+    current = weather if expand else {k: v for k, v in weather.items() if k not in BULKY_WEATHER_FIELDS}
     
     # Override for safety (PART 3.B)
     is_emergency = any(i['severity'] == "emergency" for i in insights)
     
     return {
-        "location": {"district": district, "division": district},
-        "current_weather": weather,
+        "location": {"district": district, "division": LOCATION_DIVISIONS.get(district, district)},
+        "current_weather": {"district": district, **current},
         "primary_insight": insights[0] if insights else None,
         "all_insights": insights,
         "is_emergency": is_emergency,
         "next_6_hours_risk": "high" if is_emergency or any(s['severity'] == 'high' for s in signals) else "low"
     }
 
-@app.get("/api/v1/alerts")
-def get_alerts(district: str = "Dhaka", mode: str = "general"):
-    coords = DIVISION_COORDS.get(district, DIVISION_COORDS['Dhaka'])
-    weather = fetch_real_weather(coords['lat'], coords['lng'], district)
-    if not weather: return {"alerts": []}
-    
-    signals = get_signals(weather, coords['lat'], coords['lng'])
-    insights = generate_insights(signals, mode, district)
-    
+def build_alerts(weather, district: str, mode: str):
+    return location_evaluation(weather, district, mode)[2]
+
+def alerts_from_insights(insights):
     alerts = []
     for ins in insights:
         if ins['severity'] in ['high', 'emergency']:
@@ -237,104 +648,17 @@ def get_alerts(district: str = "Dhaka", mode: str = "general"):
             })
     return {"alerts": alerts}
 
-@app.get("/api/v1/news-insights")
-def get_news_insights(district: str = "Dhaka"):
-    # NEWS DATABASE (Simulating relational schema)
-    raw_news = [
-        {"headline": "Trusted Flood Briefing", "source": "BMD", "category": "flood", "district": "Sylhet", "url": "https://www.bmd.gov.bd"},
-        {"headline": "Untrusted Rumor", "source": "Facebook Group", "category": "general", "district": "Dhaka", "url": "#"},
-        {"headline": "Heavy Rain Warning", "source": "Prothom Alo", "category": "monsoon", "district": "Chittagong", "url": "https://www.prothomalo.com"}
-    ]
-    
-    # --- ENGINE B: NEWS CLASSIFICATION ---
-    trusted_news = [n for n in raw_news if n['source'] in TRUSTED_SOURCES]
-    
-    items = []
-    for news in trusted_news:
-        items.append({
-            "news": {
-                "headline": news['headline'],
-                "bn_headline": "সংবাদ: " + news['headline'], 
-                "source": news['source'],
-                "published_at": datetime.datetime.now().isoformat(),
-                "url": news['url'],
-                "district": news['district'],
-                "category": news['category'],
-                "type": "news"
-            },
-            "insight": {
-                "why_it_matters": f"Affects the safety protocols in {news['district']}.",
-                "bn_why_it_matters": "এটি আপনার এলাকার নিরাপত্তার জন্য গুরুত্বপূর্ণ।",
-                "who_is_affected": "Residents and travelers.",
-                "bn_who_is_affected": "বনিসন্দা এবং ভ্রমণকারীরা।",
-                "what_to_do": ["Stay alert", "Follow the source link"],
-                "bn_what_to_do": ["সতর্ক থাকুন", "লিঙ্কটি দেখুন"],
-                "confidence": "High"
-            },
-            "severity": "high" if news['category'] == "flood" else "normal"
-        })
-    return {"items": items}
-
-@app.get("/api/v1/forecast")
-def get_forecast(district: str = "Dhaka"):
-    coords = DIVISION_COORDS.get(district, DIVISION_COORDS['Dhaka'])
-    weather = fetch_real_weather(coords['lat'], coords['lng'], district)
-    
-    if not weather: return {"error": "Data unavailable"}
-
-    # --- ENGINE E: TREND & COMPARISON ---
-    # Mocking yesterday's max for comparison
-    yesterday_max = weather['daily']['temperature_2m_max'][0] - random.uniform(-2, 2)
-    today_max = weather['daily']['temperature_2m_max'][0]
-    diff = today_max - yesterday_max
-    
-    comparison_text = f"Today is {abs(diff):.1f}°C {'warmer' if diff > 0 else 'cooler'} than yesterday."
-    bn_comparison_text = f"আজ গতকালের চেয়ে {abs(diff):.1f}°সে. {'উষ্ণ' if diff > 0 else 'শীতল'}।"
-
-    hourly_data = []
-    for i in range(0, 12):
-        hourly_data.append({
-            "time": weather['hourly']['time'][i][-5:],
-            "temp": f"{weather['hourly']['temperature_2m'][i]}°C",
-            "cond": map_weather_code(weather['hourly']['weathercode'][i]),
-        })
-
-    return {
-        "hourly": hourly_data,
-        "comparison": {
-            "comparisonText": comparison_text,
-            "bn_comparisonText": bn_comparison_text,
-            "trend": "up" if diff > 1 else ("down" if diff < -1 else "stable")
-        },
-        "weekly_brief": {
-            "text": "Stability expected throughout the week.",
-            "bn_text": "পুরো সপ্তাহে স্থায়িত্ব আশা করা হচ্ছে।"
-        }
-    }
-
-@app.get("/api/v1/smart-guidance")
-def get_smart_guidance_endpoint(district: str = "Dhaka", mode: str = "general"):
-    """
-    Phase 1 Smart Guidance API
-    Returns decisions, not raw weather
-    """
-    from phase1_rules import WeatherInput, HourlyForecast, get_smart_guidance, get_forecast_confidence
-    
-    coords = DIVISION_COORDS.get(district, DIVISION_COORDS['Dhaka'])
-    weather = fetch_real_weather(coords['lat'], coords['lng'], district)
-    
-    if not weather:
-        return {"error": "Weather data unavailable"}
+def build_smart_guidance(weather, district: str, mode: str):
+    from phase1_rules import WeatherInput, HourlySeries, forecast_stability, get_smart_guidance
     
     # Calculate heat index
     temp = weather['temperature']
     humidity = weather['humidity']
     heat_index = temp + (humidity / 10)
     
-    # Calculate forecast stability (variance in next 6 hours)
-    hourly_temps = weather['hourly']['temperature_2m'][:6]
-    temp_variance = max(hourly_temps) - min(hourly_temps) if len(hourly_temps) > 0 else 0
-    forecast_stability = min(temp_variance / 10, 1.0)  # Normalize to 0-1
+    # Columnar next-24h forecast from the current hour; stability is the temperature spread over the next 6 hours
+    window = time_axis(weather).window(24)
+    hourly_data = HourlySeries.from_open_meteo(weather['hourly'], start=window.start, hours=window.stop - window.start)
     
     # Build WeatherInput
     current_weather = WeatherInput(
@@ -344,27 +668,12 @@ def get_smart_guidance_endpoint(district: str = "Dhaka", mode: str = "general"):
         wind_speed=weather['windspeed'],
         heat_index=heat_index,
         lightning_risk=0.8 if "Storm" in weather['condition'] else 0.1,
-        forecast_stability=forecast_stability
+        forecast_stability=forecast_stability(hourly_data, hours=6)
     )
     
-    # Build hourly forecast
-    hourly_data = []
-    for i in range(min(24, len(weather['hourly']['time']))):
-        h_temp = weather['hourly']['temperature_2m'][i]
-        h_humidity = weather['hourly']['relative_humidity_2m'][i]
-        h_heat_index = h_temp + (h_humidity / 10)
-        h_precip = weather['hourly']['precipitation'][i]
-        
-        hourly_data.append(HourlyForecast(
-            time=weather['hourly']['time'][i][-5:],
-            temperature=h_temp,
-            humidity=h_humidity,
-            rain_probability=min(h_precip / 10, 1.0),
-            heat_index=h_heat_index
-        ))
-    
     # Get smart guidance decision
-    decision = get_smart_guidance(mode, current_weather, hourly_data)
+    with stage("guidance"):
+        decision = get_smart_guidance(mode, current_weather, hourly_data)
     
     return {
         "location": {"district": district},
@@ -377,3 +686,481 @@ def get_smart_guidance_endpoint(district: str = "Dhaka", mode: str = "general"):
             "humidity": humidity
         }
     }
+
+# --- ENGINE E: TREND & COMPARISON ---
+
+trend_cache = TrendCache(lambda weather: compute_trends(weather, rule_engine.threshold('heat_stress')))
+
+def build_forecast(weather, district: str, mode: str):
+    """
+    Next 12 hours, today vs yesterday and the multi-day trends from today on
+    "Today" is the day of the current hour; yesterday's max comes from the recorded snapshot history.
+    The forecast is the same for every mode.
+    """
+    coords = LOCATION_COORDS.get(district, DIVISION_COORDS['Dhaka'])
+    trends = trend_cache.get((coords['lat'], coords['lng']), weather)
+    axis = time_axis(weather)
+    today = min(axis.day_index(axis.current_index()), len(weather['daily']['temperature_2m_max']) - 1)
+    today_max = weather['daily']['temperature_2m_max'][today]
+    yesterday = None
+    if weather['daily'].get('time'):
+        yesterday_date = datetime.date.fromisoformat(weather['daily']['time'][today]) - datetime.timedelta(days=1)
+        yesterday = snapshot_store.daily((coords['lat'], coords['lng']), yesterday_date.isoformat())
+    
+    if yesterday is not None and yesterday['temp_max'] is not None:
+        diff = today_max - yesterday['temp_max']
+        comparison_text = f"Today is {abs(diff):.1f}°C {'warmer' if diff > 0 else 'cooler'} than yesterday."
+        bn_comparison_text = f"আজ গতকালের চেয়ে {abs(diff):.1f}°সে. {'উষ্ণ' if diff > 0 else 'শীতল'}।"
+    else:
+        diff = 0.0
+        comparison_text = "No data for yesterday yet."
+        bn_comparison_text = "গতকালের তথ্য এখনও নেই।"
+
+    hourly = weather['hourly']
+    next_12h = axis.window(12)
+    hourly_data = []
+    for i in range(next_12h.start, next_12h.stop):
+        hourly_data.append({
+            "time": axis.label(i),
+            "temp": f"{hourly['temperature_2m'][i]}°C",
+            "cond": map_weather_code(hourly['weathercode'][i]),
+        })
+
+    return {
+        "hourly": hourly_data,
+        "comparison": {
+            "comparisonText": comparison_text,
+            "bn_comparisonText": bn_comparison_text,
+            "trend": "up" if diff > 1 else ("down" if diff < -1 else "stable")
+        },
+        "weekly_brief": trends.brief(today),
+        "trends": trends.summary(today),
+    }
+
+FORECAST_MODE = "general"
+
+RESPONSE_BUILDERS = {
+    "insights": build_home_insights,
+    "alerts": build_alerts,
+    "smart-guidance": build_smart_guidance,
+    "forecast": build_forecast,
+}
+
+def current_hour(weather):
+    return time_axis(weather).current_index()
+
+# Guidance and the forecast look at the hours ahead, so their bodies are only valid for the hour they were rendered in
+response_store = ResponseStore(
+    RESPONSE_BUILDERS,
+    USER_MODES,
+    versions={"smart-guidance": current_hour, "forecast": current_hour},
+    endpoint_modes={"forecast": [FORECAST_MODE]},
+)
+alert_broadcaster = AlertBroadcaster(ALERT_STREAM_QUEUE)
+
+@timed("materialize")
+def materialize_snapshot(key, weather):
+    """
+    Cache listener: pre-renders every endpoint x mode for a fresh location snapshot
+    Alerts of a location whose evaluation was reused keep their body and ETag.
+    """
+    district = LOCATION_BY_KEY.get(key)
+    if district is not None:
+        reevaluated = evaluator.update(district, weather)
+        response_store.materialize(district, weather, reuse=() if reevaluated else ("alerts",))
+
+weather_cache.subscribe(materialize_snapshot)
+
+def push_changed_alerts(districts):
+    """Change-feed listener: offers the new alerts of changed locations to stream subscribers"""
+    for district in districts:
+        evaluation = evaluator.peek(district)
+        for mode in USER_MODES:
+            alert_broadcaster.publish((district, mode), evaluation[mode][2])
+
+evaluator.subscribe(push_changed_alerts)
+
+def rules_reloaded(rules):
+    """Rule-engine listener: re-evaluates and re-materializes every cached location"""
+    print(f"Rule table reloaded from {rules.source}")
+    evaluator.clear()
+    trend_cache.clear()
+    for key in {(c['lat'], c['lng']) for c in LOCATION_COORDS.values()}:
+        entry = weather_cache.peek(key)
+        if entry is not None:
+            materialize_snapshot(key, entry.value)
+
+rule_engine.subscribe(rules_reloaded)
+
+async def watch_rules():
+    while True:
+        await asyncio.sleep(RULES_POLL)
+        rule_engine.reload_if_changed()
+
+# --- ENGINE B: NEWS CLASSIFICATION ---
+# Articles are classified (district, category, trusted source) and rendered once per
+# ingestion; requests page through the store's prebuilt indexes.
+
+def render_news_item(article: Article):
+    where = "Bangladesh" if article.district == NATIONAL else article.district
+    return {
+        "news": {
+            "headline": article.headline,
+            "bn_headline": article.bn_headline or "সংবাদ: " + article.headline,
+            "source": article.source,
+            "published_at": article.published_iso(),
+            "url": article.url,
+            "district": article.district,
+            "districts": list(article.districts),
+            "category": article.category,
+            "type": "news"
+        },
+        "insight": {
+            "why_it_matters": f"Affects the safety protocols in {where}.",
+            "bn_why_it_matters": "এটি আপনার এলাকার নিরাপত্তার জন্য গুরুত্বপূর্ণ।",
+            "who_is_affected": "Residents and travelers.",
+            "bn_who_is_affected": "বনিসন্দা এবং ভ্রমণকারীরা।",
+            "what_to_do": ["Stay alert", "Follow the source link"],
+            "bn_what_to_do": ["সতর্ক থাকুন", "লিঙ্কটি দেখুন"],
+            "confidence": "High"
+        },
+        "severity": "high" if article.category == "flood" else "normal"
+    }
+
+news_classifier = Classifier(LOCATION_COORDS, TRUSTED_SOURCES)
+news_ingester = NewsIngester(NEWS_FEED_DIR, news_classifier, NEWS_MAX_ARTICLES, render_news_item)
+
+async def watch_news():
+    while True:
+        await asyncio.sleep(NEWS_POLL)
+        await asyncio.to_thread(news_ingester.reload_if_changed)
+
+# --- METRICS ---
+# Stage timings (bdweather_stage_seconds) are recorded where the work happens;
+# the cache and evaluator counters are read from their owners at scrape time.
+
+REQUESTS = registry.counter("bdweather_requests_total", "HTTP requests by route, district, mode and status", ("route", "district", "mode", "status"))
+REQUEST_LATENCY = registry.histogram("bdweather_request_seconds", "Time from request to response start, by route", ("route",))
+UPSTREAM_CALLS = registry.counter("bdweather_upstream_calls_total", "Open-Meteo calls by kind (single, batch) and outcome", ("kind", "outcome"))
+UPSTREAM_ERRORS = registry.counter("bdweather_upstream_errors_total", "Failed Open-Meteo calls by kind and exception type", ("kind", "error"))
+UPSTREAM_POINTS = registry.counter("bdweather_upstream_points_total", "Locations fetched from Open-Meteo")
+PREFETCHED_READS = registry.counter("bdweather_prefetched_reads_total", "Snapshots of prefetched locations served as held, without a cache lookup")
+
+def request_labels(scope):
+    """(district, mode) labels with bounded values: known names, "gps", "other" or "" when absent"""
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    if "lat" in query and "lng" in query:
+        district = "gps"
+    else:
+        district = query.get("district", [""])[0]
+        district = district if district in LOCATION_COORDS or not district else "other"
+    mode = query.get("mode", [""])[0]
+    return district, mode if mode in USER_MODES or not mode else "other"
+
+app.add_middleware(RequestMetrics, requests=REQUESTS, latency=REQUEST_LATENCY, labels=request_labels)
+
+def hit_ratio(hits, total):
+    return hits / total if total else None
+
+def news_trust_counts(store):
+    return {("true",): store.trusted_count, ("false",): len(store) - store.trusted_count}
+
+def cache_hit_ratios():
+    weather, responses, evaluation = weather_cache.stats(), response_store.stats(), evaluator.stats()
+    weather_hits = weather['hits'] + weather['stale_hits'] + PREFETCHED_READS.value()
+    return {
+        ("weather",): hit_ratio(weather_hits, weather_hits + weather['misses']),
+        ("response",): hit_ratio(responses['hits'], responses['hits'] + responses['misses'] + responses['rerenders']),
+        ("evaluation",): hit_ratio(evaluation['skipped'], evaluation['skipped'] + evaluation['evaluations']),
+    }
+
+registry.observed(
+    "counter", "bdweather_weather_cache_lookups_total", "Weather cache lookups: hit, stale (served while refreshing) or miss", ("result",),
+    lambda: {("hit",): weather_cache.hits, ("stale",): weather_cache.stale_hits, ("miss",): weather_cache.misses},
+)
+registry.observed(
+    "counter", "bdweather_load_shed_total", "Location fetches shed (rate limit or open circuit), single, bulk or prefetch", (),
+    lambda: {(): weather_cache.shed},
+)
+registry.observed(
+    "gauge", "bdweather_upstream_rate_tokens", "Upstream rate-limit tokens available (negative: reserved ahead)", (),
+    lambda: {(): upstream_limiter.status()['tokens']} if upstream_limiter is not None else {},
+)
+registry.observed(
+    "counter", "bdweather_upstream_rate_limited_total", "Upstream calls or hedges refused by the rate limiter", (),
+    lambda: {(): upstream_limiter.rejected} if upstream_limiter is not None else {},
+)
+registry.observed(
+    "counter", "bdweather_response_store_lookups_total", "Materialized response lookups: hit, miss or rerender (hour changed)", ("result",),
+    lambda: {("hit",): response_store.hits, ("miss",): response_store.misses, ("rerender",): response_store.rerenders},
+)
+registry.observed(
+    "counter", "bdweather_evaluations_total", "Location evaluations on new snapshots: evaluated or reused (inputs unchanged)", ("result",),
+    lambda: {("evaluated",): evaluator.evaluations, ("reused",): evaluator.skipped},
+)
+registry.observed(
+    "counter", "bdweather_snapshot_write_errors_total", "Snapshots the on-disk history failed to record", (),
+    lambda: {(): snapshot_store.write_errors},
+)
+registry.observed(
+    "counter", "bdweather_cache_listener_errors_total", "Weather cache listeners (materialize, publish, persist) that raised", (),
+    lambda: {(): weather_cache.listener_errors},
+)
+registry.observed("gauge", "bdweather_cache_hit_ratio", "Share of lookups served without recomputation, by cache", ("cache",), cache_hit_ratios)
+registry.observed("gauge", "bdweather_weather_cache_entries", "Locations held in the weather cache", (), lambda: {(): weather_cache.stats()['entries']})
+registry.observed(
+    "gauge", "bdweather_news_articles", "Articles in the news store, by source trust", ("trusted",),
+    lambda: news_trust_counts(news_ingester.store),
+)
+registry.observed("gauge", "bdweather_alert_stream_subscribers", "Open alert streams", (), lambda: {(): alert_broadcaster.subscriber_count()})
+registry.observed(
+    "gauge", "bdweather_upstream_circuit_open", "1 while the upstream circuit breaker rejects calls", (),
+    lambda: {(): int(resilient_upstream.breaker.state == "open")},
+)
+
+profiler = SamplingProfiler()
+registry.observed("gauge", "bdweather_profiler_running", "1 while the sampling profiler is active", (), lambda: {(): int(profiler.running)})
+
+def profiler_denied(request: Request):
+    """Response to return when the profiler endpoints are disabled or the token doesn't match, else None"""
+    if not PROFILER_TOKEN:
+        return JSONResponse({"error": "Profiler disabled"}, status_code=404)
+    if not hmac.compare_digest(request.headers.get("x-profiler-token", ""), PROFILER_TOKEN):
+        return JSONResponse({"error": "Invalid profiler token"}, status_code=403)
+    return None
+
+# --- API ENDPOINTS ---
+
+@app.exception_handler(LoadShedError)
+async def load_shed_response(request: Request, exc: LoadShedError):
+    """Nothing cached to degrade to and no upstream budget: ask the client to come back"""
+    return JSONResponse(
+        {"error": "Weather service is busy, please retry shortly"},
+        status_code=503,
+        headers={"Retry-After": str(max(math.ceil(exc.retry_after), 1))},
+    )
+
+@app.get("/")
+async def read_root():
+    return {"message": "Bangladesh Weather Intelligence API", "version": "v1.2 (Blueprint Aligned)"}
+
+@app.get("/api/v1/health")
+async def get_health():
+    health = refresher.snapshot()
+    health["worker_role"] = "writer" if owns_upstream() else "reader"
+    health["upstream"] = resilient_upstream.status()
+    health["alert_stream_subscribers"] = alert_broadcaster.subscriber_count()
+    health["evaluation"] = evaluator.stats()
+    health["news"] = news_ingester.status()
+    return health
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of this worker's metrics"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.post("/api/v1/profiler/start")
+async def start_profiler(request: Request, interval_ms: Optional[float] = None):
+    """
+    Starts sampling this worker's event-loop thread (clears earlier samples)
+    Requires PROFILER_TOKEN; with several workers, each call reaches one of them.
+    """
+    denied = profiler_denied(request)
+    if denied:
+        return denied
+    interval = PROFILER_INTERVAL if interval_ms is None else max(interval_ms, 1) / 1000
+    started = profiler.start(interval=interval)  # endpoint runs on the event-loop thread
+    return {"started": started, **profiler.status()}
+
+@app.post("/api/v1/profiler/stop")
+async def stop_profiler(request: Request):
+    denied = profiler_denied(request)
+    if denied:
+        return denied
+    stopped = profiler.stop()
+    return {"stopped": stopped, **profiler.status()}
+
+@app.get("/api/v1/profiler")
+async def get_profile(request: Request, format: str = "collapsed"):
+    """Samples so far: collapsed stacks (flamegraph.pl / speedscope input) or format=status"""
+    denied = profiler_denied(request)
+    if denied:
+        return denied
+    if format == "status":
+        return profiler.status()
+    return PlainTextResponse(profiler.collapsed())
+
+@app.get("/api/v1/insights/home")
+async def get_home_insights(request: Request, district: str = "Dhaka", lat: Optional[float] = Query(None, ge=-90, le=90), lng: Optional[float] = Query(None, ge=-180, le=180), mode: str = "general", fields: Optional[str] = None):
+    """
+    fields: optional comma-separated projection, e.g. "current_weather.temperature,primary_insight".
+    Without it, current_weather is returned without the raw hourly/daily series;
+    request "current_weather.hourly" / "current_weather.daily" to get them.
+    """
+    district, coords = resolve_location(district, lat, lng)
+    weather = await get_cached_weather(coords)
+    
+    if not weather:
+        return {"error": "Weather data unavailable"}
+    
+    max_age = snapshot_max_age(coords)
+    paths = parse_fields(fields)
+    if paths:
+        return json_response(request, project(build_home_insights(weather, district, mode, expand=True), paths), max_age, data_age(coords))
+    cached = response_store.get("insights", district, mode, weather)
+    if cached:
+        return cached.to_response(request, max_age, data_age(coords))
+    return json_response(request, build_home_insights(weather, district, mode), max_age, data_age(coords))
+
+@app.get("/api/v1/alerts")
+async def get_alerts(request: Request, district: str = "Dhaka", lat: Optional[float] = Query(None, ge=-90, le=90), lng: Optional[float] = Query(None, ge=-180, le=180), mode: str = "general"):
+    district, coords = resolve_location(district, lat, lng)
+    weather = await get_cached_weather(coords)
+    if not weather: return {"alerts": []}
+    
+    max_age = snapshot_max_age(coords)
+    cached = response_store.get("alerts", district, mode, weather)
+    if cached:
+        return cached.to_response(request, max_age, data_age(coords))
+    return json_response(request, build_alerts(weather, district, mode), max_age, data_age(coords))
+
+@app.get("/api/v1/alerts/stream")
+async def stream_alerts(district: str = "Dhaka", lat: Optional[float] = Query(None, ge=-90, le=90), lng: Optional[float] = Query(None, ge=-180, le=180), mode: str = "general"):
+    """
+    Server-Sent Events: the current alerts, then an event each time a new
+    snapshot changes the alert set for this district and mode
+    Unknown districts follow Dhaka, unknown modes follow general.
+    """
+    district, coords = resolve_location(district, lat, lng)
+    if district not in LOCATION_COORDS:
+        district = 'Dhaka'
+    if mode not in USER_MODES:
+        mode = 'general'
+    key = (district, mode)
+    if alert_broadcaster.latest(key) is None:
+        weather = await get_cached_weather(LOCATION_COORDS[district])
+        if weather and alert_broadcaster.latest(key) is None:
+            alert_broadcaster.publish(key, build_alerts(weather, district, mode))
+
+    return StreamingResponse(
+        alert_broadcaster.stream(key, ALERT_STREAM_KEEPALIVE),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/v1/news-insights")
+async def get_news_insights(
+    request: Request,
+    district: str = "Dhaka",
+    category: Optional[str] = None,
+    limit: int = Query(NEWS_PAGE_SIZE, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Trusted-source news for a district (plus national news), newest first
+    Unknown district names get news from every district.
+    """
+    store = news_ingester.store
+    items, total = store.query(news_classifier.canonical(district), category and category.lower(), True, offset, limit)
+    next_offset = offset + len(items)
+    payload = {
+        "items": items,
+        "total": total,
+        "offset": offset,
+        "next_offset": next_offset if next_offset < total else None,
+        "version": store.version,
+    }
+    return json_response(request, payload, NEWS_MAX_AGE)
+
+@app.get("/api/v1/forecast")
+async def get_forecast(request: Request, district: str = "Dhaka", lat: Optional[float] = Query(None, ge=-90, le=90), lng: Optional[float] = Query(None, ge=-180, le=180)):
+    district, coords = resolve_location(district, lat, lng)
+    weather = await get_cached_weather(coords)
+    
+    if not weather: return {"error": "Data unavailable"}
+
+    max_age = snapshot_max_age(coords)
+    cached = response_store.get("forecast", district, FORECAST_MODE, weather)
+    if cached:
+        return cached.to_response(request, max_age, data_age(coords))
+    return json_response(request, build_forecast(weather, district, FORECAST_MODE), max_age, data_age(coords))
+
+@app.get("/api/v1/smart-guidance")
+async def get_smart_guidance_endpoint(request: Request, district: str = "Dhaka", lat: Optional[float] = Query(None, ge=-90, le=90), lng: Optional[float] = Query(None, ge=-180, le=180), mode: str = "general", fields: Optional[str] = None):
+    """
+    Phase 1 Smart Guidance API
+    Returns decisions, not raw weather
+    
+    fields: optional comma-separated projection, e.g. "decision.status,decision.advice"
+    """
+    district, coords = resolve_location(district, lat, lng)
+    weather = await get_cached_weather(coords)
+    
+    if not weather:
+        return {"error": "Weather data unavailable"}
+    
+    max_age = snapshot_max_age(coords)
+    paths = parse_fields(fields)
+    if paths:
+        return json_response(request, project(build_smart_guidance(weather, district, mode), paths), max_age, data_age(coords))
+    cached = response_store.get("smart-guidance", district, mode, weather)
+    if cached:
+        return cached.to_response(request, max_age, data_age(coords))
+    return json_response(request, build_smart_guidance(weather, district, mode), max_age, data_age(coords))
+
+def rendered(endpoint: str, district: str, mode: str, weather) -> bytes:
+    """Materialized body for the snapshot held, rendered on the spot if there is none"""
+    cached = response_store.get(endpoint, district, mode, weather)
+    return cached.body if cached else encode_json(RESPONSE_BUILDERS[endpoint](weather, district, mode))
+
+ALERTS_BODY_PREFIX = b'{"alerts":'
+
+@app.get("/api/v1/insights/bulk")
+async def get_bulk_insights(request: Request, districts: str = "all", mode: str = "general"):
+    """
+    Insights, alerts and guidance for many locations in one response
+
+    districts: comma-separated names, or "all" for every known location.
+    Snapshots are shared with the single-location endpoints; locations not
+    cached yet are fetched in one batched upstream call. Per-location bodies
+    come from the materialized store and are spliced, not re-encoded.
+    A partial response (some locations unavailable) is sent with no-store;
+    if none could be served the request gets a 503 with Retry-After.
+    """
+    if districts.strip().lower() == "all":
+        names = list(LOCATION_COORDS)
+    else:
+        names = list(dict.fromkeys(n.strip() for n in districts.split(",") if n.strip()))
+    known = [n for n in names if n in LOCATION_COORDS]
+    unknown = [n for n in names if n not in LOCATION_COORDS]
+    snapshots = await get_cached_weather_many(known)
+
+    parts, max_age = [], None
+    for name in known:
+        weather = snapshots.get(name)
+        if weather is None:
+            continue
+        coords = LOCATION_COORDS[name]
+        max_age = snapshot_max_age(coords) if max_age is None else min(max_age, snapshot_max_age(coords))
+        alerts = rendered("alerts", name, mode, weather)
+        parts.append(
+            encode_json(name) + b':{"insights":' + rendered("insights", name, mode, weather)
+            + b',"alerts":' + alerts[len(ALERTS_BODY_PREFIX):-1]
+            + b',"guidance":' + rendered("smart-guidance", name, mode, weather)
+            + b',' + encode_json(data_age(coords))[1:]
+        )
+    unavailable = [n for n in known if snapshots.get(n) is None]
+    if known and not parts:
+        # Nothing to serve (shed or upstream down): 503 like the single-location endpoints
+        raise LoadShedError(shed_retry_after())
+
+    body = (
+        b'{"mode":' + encode_json(mode) + b',"count":' + str(len(parts)).encode()
+        + b',"districts":{' + b",".join(parts) + b'}'
+        + b',"unavailable":' + encode_json(unavailable) + b',"unknown":' + encode_json(unknown) + b'}'
+    )
+    response = conditional_response(request, body, WEATHER_CACHE_TTL if max_age is None else max_age)
+    if unavailable:
+        # A partial dashboard must not be kept by shared caches while the gaps fill in
+        response.headers["Cache-Control"] = "no-store"
+    return response
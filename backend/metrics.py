@@ -0,0 +1,263 @@
+"""
+Metrics
+Process-local counters and latency histograms, rendered in the Prometheus
+text exposition format (version 0.0.4) for GET /metrics
+
+Stdlib only. Every uvicorn worker keeps its own registry, so a scrape sees
+the worker that answered it; scrape each worker (or run one) for totals.
+METRICS_ENABLED=0 turns the stage timers into no-ops.
+"""
+
+import bisect
+import functools
+import math
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+
+# Seconds; spans sub-microsecond engine stages up to slow upstream calls
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram per label combination"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Labels, List[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def time(self, *labels: str) -> "Timer":
+        """Context manager observing the elapsed wall time of its block"""
+        return Timer(self, labels)
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterable[str]:
+        bounds = self.buckets + (math.inf,)
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                le = 'le="' + _number(bound) + '"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels: Labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> "Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+class Observed:
+    """
+    Counter or gauge whose values are read from elsewhere at scrape time
+
+    collect() returns {label values: value}, e.g. the counters a cache keeps itself.
+    """
+
+    def __init__(self, kind: str, name: str, help: str, labelnames: Sequence[str], collect: Callable[[], Dict[Labels, float]]):
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self.collect().items()):
+            if value is not None:
+                yield f"{self.name}{_labels(self.labelnames, labels)} {_number(float(value))}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+
+    def _add(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def observed(self, kind: str, name: str, help: str, labelnames: Sequence[str], collect: Callable[[], Dict[Labels, float]]) -> Observed:
+        return self._add(Observed(kind, name, help, labelnames, collect))
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+stage_seconds = registry.histogram(
+    "bdweather_stage_seconds",
+    "Wall time of one hot-path stage (upstream fetch, JSON decode, signals, insights, guidance, encode)",
+    ("stage",),
+)
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NO_TIMER = _NoTimer()
+
+
+def stage(name: str):
+    """Context manager timing one stage into bdweather_stage_seconds"""
+    return stage_seconds.time(name) if ENABLED else _NO_TIMER
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator: every call of a synchronous function is one `name` stage"""
+    def decorate(fn: Callable) -> Callable:
+        if not ENABLED:
+            return fn
+        observe = stage_seconds.observe
+        clock = time.perf_counter
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(clock() - started, name)
+        return wrapper
+    return decorate
+
+
+class RequestMetrics:
+    """
+    ASGI middleware: request count and latency per route
+
+    Latency is measured up to the response start (status and headers), which
+    for JSON responses is after encoding and for event streams is the
+    time to open the stream. labels(scope) returns the label values added to
+    the request counter between route and status (e.g. district and mode).
+    """
+
+    def __init__(
+        self,
+        app,
+        requests: Counter,
+        latency: Histogram,
+        labels: Optional[Callable[[Dict[str, Any]], Labels]] = None,
+    ):
+        self.app = app
+        self.requests = requests
+        self.latency = latency
+        self.labels = labels
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                route = scope.get("route")
+                self.latency.observe(time.perf_counter() - started, getattr(route, "path", "unmatched"))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            extra = self.labels(scope) if self.labels else ()
+            self.requests.inc(route, *extra, str(status[0]))
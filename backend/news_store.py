@@ -0,0 +1,418 @@
+"""
+News Store
+Streaming ingestion of local RSS and JSON feeds into an immutable, indexed article store
+
+Feeds are files in one directory: RSS 2.0 (.xml, .rss), JSON Feed pages
+(.json, following next_url to further local pages) and JSON Lines (.jsonl, one
+article per line). RSS and JSON Lines are parsed incrementally, so a large
+feed is never held as a whole document. Every article is classified once at
+ingestion: districts (given, else every district its text names, else
+national), category (given, else by keyword) and trusted (source in the
+trusted set).
+
+A load builds a new NewsStore, newest first, with position lists for every
+(district, category, trusted) combination a query can ask for; readers keep
+the old store until the new one is swapped in, so a query never sees a
+partial load and is a merge of at most two prebuilt lists.
+"""
+
+import datetime
+import email.utils
+import hashlib
+import itertools
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from heapq import merge
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+from json_codec import loads
+
+NATIONAL = "All"  # district of articles not tied to one district
+
+# First category with a match wins; matched against the headline and summary, ignoring case
+CATEGORY_KEYWORDS = {
+    "cyclone": ("cyclone", "storm surge", "depression", "ঘূর্ণিঝড়", "লঘুচাপ"),
+    "flood": ("flood", "danger level", "বন্যা"),
+    "heatwave": ("heatwave", "heat wave", "heat stress", "তাপপ্রবাহ"),
+    "monsoon": ("monsoon", "heavy rain", "rainfall", "বৃষ্টি"),
+}
+DEFAULT_CATEGORY = "general"
+
+# Older spellings still common in feeds
+DISTRICT_ALIASES = {
+    "Chittagong": "Chattogram", "Barisal": "Barishal", "Comilla": "Cumilla",
+    "Jessore": "Jashore", "Bogra": "Bogura",
+}
+
+_WORD = re.compile(r"[\w']+")
+
+Raw = Dict[str, Any]
+IndexKey = Tuple[Optional[str], Optional[str], bool]  # (district, category, trusted only); None = any
+
+
+@dataclass(slots=True)
+class Article:
+    id: str
+    headline: str
+    bn_headline: str
+    summary: str
+    source: str
+    url: str
+    published_at: float  # unix seconds
+    districts: Tuple[str, ...]  # (NATIONAL,) when no district is named
+    category: str
+    trusted: bool
+
+    @property
+    def district(self) -> str:
+        """Primary district: the given one or the first named"""
+        return self.districts[0]
+
+    def published_iso(self) -> str:
+        return datetime.datetime.fromtimestamp(self.published_at, tz=datetime.timezone.utc).isoformat()
+
+
+# --- Feed parsers: path -> raw items {id, headline, bn_headline, summary, source, url, published, district, category} ---
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    return (elem.text or "").strip() if elem is not None else ""
+
+
+def iter_rss(path: str, visited: Set[str]) -> Iterator[Raw]:
+    """
+    RSS 2.0 items, one at a time (iterparse; each item is cleared once read)
+    <category domain="district"> sets the district, any other <category> the category.
+    """
+    visited.add(path)
+    channel_title = ""
+    in_item = False
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            in_item = in_item or tag == "item"
+            continue
+        if tag == "title" and not in_item and not channel_title:
+            channel_title = _text(elem)
+        if tag != "item":
+            continue
+        in_item = False
+        fields: Raw = {"district": None, "category": None}
+        for child in elem:
+            name = _local(child.tag)
+            if name == "category":
+                fields["district" if child.get("domain") == "district" else "category"] = _text(child)
+            else:
+                fields.setdefault(name, _text(child))
+        yield {
+            "id": fields.get("guid") or fields.get("link"),
+            "headline": fields.get("title", ""),
+            "bn_headline": fields.get("bn_title", ""),
+            "summary": fields.get("description", ""),
+            "source": fields.get("source") or channel_title,
+            "url": fields.get("link", ""),
+            "published": fields.get("pubDate"),
+            "district": fields["district"],
+            "category": fields["category"],
+        }
+        elem.clear()
+
+
+def _next_page(path: str, next_url: Optional[str]) -> Optional[str]:
+    """Local file behind a JSON Feed next_url (relative path or file:// URL); remote pages are not followed"""
+    if not next_url:
+        return None
+    url = urlparse(next_url)
+    if url.scheme == "file":
+        return unquote(url.path)
+    if url.scheme:
+        return None
+    return os.path.join(os.path.dirname(path), next_url)
+
+
+def iter_json_feed(path: str, visited: Set[str]) -> Iterator[Raw]:
+    """
+    JSON Feed 1.1 items, page by page along next_url
+    Extension fields: "_bdweather": {"district", "category", "bn_title"}.
+    """
+    while path and path not in visited:
+        visited.add(path)
+        with open(path, "rb") as f:
+            page = loads(f.read())
+        feed_title = page.get("title", "")
+        for item in page.get("items", ()):
+            extra = item.get("_bdweather") or {}
+            authors = item.get("authors") or page.get("authors") or [{}]
+            yield {
+                "id": item.get("id"),
+                "headline": item.get("title", ""),
+                "bn_headline": extra.get("bn_title", ""),
+                "summary": item.get("summary") or item.get("content_text", ""),
+                "source": authors[0].get("name") or feed_title,
+                "url": item.get("url", ""),
+                "published": item.get("date_published"),
+                "district": extra.get("district"),
+                "category": extra.get("category"),
+            }
+        path = _next_page(path, page.get("next_url"))
+
+
+def iter_json_lines(path: str, visited: Set[str]) -> Iterator[Raw]:
+    """One flat article object per line, in the API's own field names"""
+    visited.add(path)
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = loads(line)
+            yield {
+                "id": item.get("id"),
+                "headline": item.get("headline", ""),
+                "bn_headline": item.get("bn_headline", ""),
+                "summary": item.get("summary", ""),
+                "source": item.get("source", ""),
+                "url": item.get("url", ""),
+                "published": item.get("published_at"),
+                "district": item.get("district"),
+                "category": item.get("category"),
+            }
+
+
+FEED_PARSERS: Dict[str, Callable[[str, Set[str]], Iterator[Raw]]] = {
+    ".xml": iter_rss,
+    ".rss": iter_rss,
+    ".json": iter_json_feed,
+    ".jsonl": iter_json_lines,
+}
+
+
+def parse_time(value: Any) -> Optional[float]:
+    """RFC 822 (RSS) or ISO 8601 (JSON) timestamp, or unix seconds; naive times are UTC"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+class Classifier:
+    """Turns raw feed items into Articles: district, category and trust are decided here, once"""
+
+    def __init__(self, districts: Iterable[str], trusted_sources: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self.trusted_sources = frozenset(trusted_sources)
+        self._names = {name.lower(): name for name in districts}
+        self._names.update({alias.lower(): name for alias, name in (aliases or DISTRICT_ALIASES).items()})
+        # Mentions are found by looking up word n-grams, longest first: one dict probe per word
+        # and length instead of a regex alternation over every name
+        self._ngrams = {" ".join(_WORD.findall(key)): name for key, name in self._names.items()}
+        self._max_words = max((key.count(" ") + 1 for key in self._ngrams), default=0)
+        self._keywords = [
+            (category, re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE))
+            for category, keywords in CATEGORY_KEYWORDS.items()
+        ]
+
+    def canonical(self, name: Optional[str]) -> Optional[str]:
+        """Known district name for name (any case, old spellings), else None"""
+        return self._names.get(name.strip().lower()) if name else None
+
+    def districts(self, given: Optional[str], text: str) -> Tuple[str, ...]:
+        name = self.canonical(given)
+        if name:
+            return (name,)
+        words = _WORD.findall(text.lower())
+        named: Dict[str, None] = {}
+        i = 0
+        while i < len(words):
+            for n in range(min(self._max_words, len(words) - i), 0, -1):
+                name = self._ngrams.get(words[i] if n == 1 else " ".join(words[i:i + n]))
+                if name:
+                    named[name] = None
+                    i += n - 1
+                    break
+            i += 1
+        return tuple(named) or (NATIONAL,)
+
+    def category(self, given: Optional[str], text: str) -> str:
+        if given and given.strip().lower() in CATEGORY_KEYWORDS:
+            return given.strip().lower()
+        for category, keywords in self._keywords:
+            if keywords.search(text):
+                return category
+        return (given or DEFAULT_CATEGORY).strip().lower()
+
+    def article(self, raw: Raw, fallback_time: float) -> Optional[Article]:
+        """None for items without a headline"""
+        headline = (raw.get("headline") or "").strip()
+        if not headline:
+            return None
+        source = (raw.get("source") or "").strip()
+        text = f"{headline} {raw.get('summary') or ''}"
+        published = parse_time(raw.get("published"))
+        url = raw.get("url") or ""
+        return Article(
+            id=str(raw.get("id") or url or hashlib.sha1(f"{source}\0{headline}".encode()).hexdigest()),
+            headline=headline,
+            bn_headline=raw.get("bn_headline") or "",
+            summary=raw.get("summary") or "",
+            source=source,
+            url=url,
+            published_at=fallback_time if published is None else published,
+            districts=self.districts(raw.get("district"), text),
+            category=self.category(raw.get("category"), text),
+            trusted=source in self.trusted_sources,
+        )
+
+
+class NewsStore:
+    """
+    Immutable snapshot of the ingested articles, newest first
+
+    render(article) (optional) builds each article's response item once, at
+    load time; query() returns those items.
+    """
+
+    def __init__(self, articles: Iterable[Article], max_articles: int = 0, render: Optional[Callable[[Article], Any]] = None):
+        unique = {a.id: a for a in articles}  # later duplicates (e.g. re-published items) win
+        ordered = sorted(unique.values(), key=lambda a: (-a.published_at, a.id))
+        self.articles: List[Article] = ordered[:max_articles] if max_articles > 0 else ordered
+        self.items: Sequence[Any] = [render(a) for a in self.articles] if render else self.articles
+        self.index: Dict[IndexKey, List[int]] = {}
+        for position, article in enumerate(self.articles):
+            for district in article.districts + (None,):
+                for category in (article.category, None):
+                    for trusted_only in ((False, True) if article.trusted else (False,)):
+                        self.index.setdefault((district, category, trusted_only), []).append(position)
+        digest = hashlib.sha1()
+        for article in self.articles:
+            digest.update(f"{article.id}\0{article.published_at}\0".encode())
+        self.version = digest.hexdigest()[:16]
+        self.loaded_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    @property
+    def trusted_count(self) -> int:
+        return len(self.index.get((None, None, True), ()))
+
+    def query(
+        self,
+        district: Optional[str] = None,
+        category: Optional[str] = None,
+        trusted_only: bool = True,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Tuple[List[Any], int]:
+        """
+        (page of items, total matches), newest first
+        A district also gets national articles; None or NATIONAL means every district.
+        """
+        if district is None or district == NATIONAL:
+            lists = [self.index.get((None, category, trusted_only), [])]
+        else:
+            lists = [self.index.get((district, category, trusted_only), []), self.index.get((NATIONAL, category, trusted_only), [])]
+        total = sum(len(positions) for positions in lists)
+        ordered = merge(*lists) if len(lists) > 1 else iter(lists[0])
+        page = [self.items[position] for position in itertools.islice(ordered, offset, offset + limit)]
+        return page, total
+
+
+class NewsIngester:
+    """
+    Holds the active NewsStore and rebuilds it when the feed directory changes
+
+    reload_if_changed() compares file names, sizes and mtimes; it does the
+    parsing itself, so call it off the event loop. A feed that fails to parse
+    is skipped (and reported in status()) without dropping the others.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        classifier: Classifier,
+        max_articles: int = 0,
+        render: Optional[Callable[[Article], Any]] = None,
+    ):
+        self.directory = directory
+        self.classifier = classifier
+        self.max_articles = max_articles
+        self.render = render
+        self.store = NewsStore((), render=render)
+        self.errors: Dict[str, str] = {}
+        self.loads = 0
+        self._signature: Optional[Tuple] = None
+
+    def feed_files(self) -> List[str]:
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError:
+            return []
+        return [os.path.join(self.directory, n) for n in names if os.path.splitext(n)[1].lower() in FEED_PARSERS]
+
+    def _stat_signature(self, paths: List[str]) -> Tuple:
+        signature = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, st.st_size, st.st_mtime_ns))
+        return tuple(signature)
+
+    def reload_if_changed(self) -> bool:
+        paths = self.feed_files()
+        signature = self._stat_signature(paths)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self.load(paths)
+        return True
+
+    def load(self, paths: Optional[List[str]] = None) -> NewsStore:
+        paths = self.feed_files() if paths is None else paths
+        visited: Set[str] = set()
+        articles: List[Article] = []
+        errors: Dict[str, str] = {}
+        for path in paths:
+            if path in visited:
+                continue  # already read as a later page of another feed
+            try:
+                fallback_time = os.path.getmtime(path)
+                parse = FEED_PARSERS[os.path.splitext(path)[1].lower()]
+                feed = [self.classifier.article(raw, fallback_time) for raw in parse(path, visited)]
+                articles.extend(a for a in feed if a is not None)
+            except (OSError, ValueError, SyntaxError, AttributeError, TypeError) as e:  # ET.ParseError is a SyntaxError
+                errors[os.path.basename(path)] = f"{type(e).__name__}: {e}"
+                print(f"News feed {path} skipped: {e}")
+        self.store = NewsStore(articles, self.max_articles, self.render)
+        self.errors = errors
+        self.loads += 1
+        return self.store
+
+    def status(self) -> Dict[str, Any]:
+        store = self.store
+        return {
+            "directory": self.directory,
+            "articles": len(store),
+            "trusted": store.trusted_count,
+            "version": store.version,
+            "loaded_at": datetime.datetime.fromtimestamp(store.loaded_at, tz=datetime.timezone.utc).isoformat(),
+            "loads": self.loads,
+            "errors": self.errors,
+        }
@@ -4,12 +4,22 @@ Python implementation of decision-making intelligence
 Returns decisions, not raw weather data
 """
 
+import os
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from types import SimpleNamespace
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 
+import numpy as np
 
-@dataclass
+from rule_table import DEFAULT_RULES_FILE, RuleEngine
+
+# Thresholds and outcomes live in the rule table (data/rules.json), compiled at import
+# and recompiled by rule_engine.reload_if_changed() when the file is edited
+rule_engine = RuleEngine(os.environ.get("RULES_FILE", DEFAULT_RULES_FILE))
+
+
+@dataclass(slots=True)
 class WeatherInput:
     """Shared data model for all rule engines"""
     temperature: float
@@ -21,7 +31,7 @@ class WeatherInput:
     forecast_stability: float
 
 
-@dataclass
+@dataclass(slots=True)
 class HourlyForecast:
     """Hourly forecast data point"""
     time: str
@@ -31,6 +41,131 @@ class HourlyForecast:
     heat_index: float
 
 
+class HourlySeries:
+    """
+    Columnar hourly forecast: one NumPy array per variable
+    
+    Accepted by every rule function that takes a List[HourlyForecast], so a
+    full 7-day horizon is evaluated with array operations instead of one
+    Python object per hour. float64 arrays (e.g. rows of the shared-state
+    mmap) are used as views, not copied.
+    
+    Time labels ("HH:MM") stay as the source strings, addressed through an
+    offset, and are only formatted for the hours a decision reports. Derived
+    columns and weathercode are computed on first use.
+    """
+    
+    __slots__ = (
+        "_times", "_offset", "temperature", "humidity", "precipitation",
+        "_weathercode", "_heat_index", "_rain_probability",
+    )
+    
+    def __init__(self, time, temperature, humidity, precipitation, weathercode=None, time_offset: int = 0):
+        """
+        time: labels or Open-Meteo timestamps (label = last 5 characters);
+            hour i of the series is time[time_offset + i]
+        """
+        self._times = time
+        self._offset = time_offset
+        self.temperature = np.asarray(temperature, dtype=np.float64)
+        self.humidity = np.asarray(humidity, dtype=np.float64)
+        self.precipitation = np.asarray(precipitation, dtype=np.float64)
+        self._weathercode = weathercode
+        self._heat_index = None
+        self._rain_probability = None
+    
+    @classmethod
+    def from_open_meteo(cls, hourly: Dict[str, Any], start: int = 0, hours: Optional[int] = None) -> "HourlySeries":
+        """Builds a series from an Open-Meteo `hourly` block, optionally windowed"""
+        window = slice(start, None if hours is None else start + hours)
+        # One conversion for the three float columns; the rows are views into it
+        block = np.array(
+            (hourly['temperature_2m'][window], hourly['relative_humidity_2m'][window], hourly['precipitation'][window]),
+            dtype=np.float64,
+        )
+        weathercode = hourly.get('weathercode')
+        return cls(
+            time=hourly['time'],
+            temperature=block[0],
+            humidity=block[1],
+            precipitation=block[2],
+            weathercode=None if weathercode is None else weathercode[window],
+            time_offset=start,
+        )
+    
+    @property
+    def weathercode(self) -> np.ndarray:
+        if self._weathercode is None:
+            self._weathercode = np.zeros(len(self), dtype=np.int16)
+        elif not isinstance(self._weathercode, np.ndarray):
+            self._weathercode = np.asarray(self._weathercode, dtype=np.int16)
+        return self._weathercode
+    
+    # Same proxies the per-hour path uses
+    
+    @property
+    def heat_index(self) -> np.ndarray:
+        if self._heat_index is None:
+            self._heat_index = self.temperature + self.humidity / 10
+        return self._heat_index
+    
+    @property
+    def rain_probability(self) -> np.ndarray:
+        if self._rain_probability is None:
+            self._rain_probability = np.minimum(self.precipitation / 10, 1.0)
+        return self._rain_probability
+    
+    @property
+    def time(self) -> np.ndarray:
+        return np.asarray(self.labels(range(len(self))), dtype=str)
+    
+    def labels(self, hours) -> List[str]:
+        """"HH:MM" labels for the given hour indexes of this series"""
+        times, offset = self._times, self._offset
+        return [times[offset + int(i)][-5:] for i in hours]
+    
+    def __len__(self) -> int:
+        return len(self.temperature)
+    
+    def __getitem__(self, index: slice) -> "HourlySeries":
+        """Slicing returns a series of views, e.g. series[:6]"""
+        rows = range(len(self))[index]
+        if rows.step != 1:
+            raise ValueError("HourlySeries only supports contiguous slices")
+        view = HourlySeries(
+            self._times, self.temperature[index], self.humidity[index], self.precipitation[index],
+            None if self._weathercode is None else self._weathercode[index],
+            self._offset + rows.start,
+        )
+        if self._heat_index is not None:
+            view._heat_index = self._heat_index[index]
+        if self._rain_probability is not None:
+            view._rain_probability = self._rain_probability[index]
+        return view
+    
+    def __iter__(self):
+        labels = self.labels(range(len(self)))
+        rows = zip(
+            labels, self.temperature.tolist(), self.humidity.tolist(),
+            self.rain_probability.tolist(), self.heat_index.tolist(),
+        )
+        for label, temperature, humidity, rain_probability, heat_index in rows:
+            yield HourlyForecast(label, temperature, humidity, rain_probability, heat_index)
+
+
+Hourly = Union[List[HourlyForecast], HourlySeries]
+
+
+def forecast_stability(series: HourlySeries, hours: int = 6) -> float:
+    """
+    Temperature spread over the next `hours`, normalized to 0-1 (lower = more stable)
+    """
+    temps = series.temperature[:hours]
+    if len(temps) == 0:
+        return 0.0
+    return float(min((temps.max() - temps.min()) / 10, 1.0))
+
+
 # ============================================================================
 # FORECAST CONFIDENCE ENGINE
 # ============================================================================
@@ -45,12 +180,7 @@ def get_forecast_confidence(forecast_stability: float) -> str:
     Returns:
         "HIGH" | "MEDIUM" | "LOW"
     """
-    if forecast_stability < 0.3:
-        return "HIGH"
-    elif forecast_stability < 0.6:
-        return "MEDIUM"
-    else:
-        return "LOW"
+    return rule_engine.decide("forecast_confidence", SimpleNamespace(forecast_stability=forecast_stability))
 
 
 # ============================================================================
@@ -64,29 +194,29 @@ def work_safety_status(data: WeatherInput) -> str:
     Returns:
         "UNSAFE" | "CAUTION" | "SAFE"
     """
-    if data.heat_index >= 41 or data.lightning_risk > 0.6:
-        return "UNSAFE"
-    elif data.heat_index >= 35:
-        return "CAUTION"
-    else:
-        return "SAFE"
+    return rule_engine.decide("work_safety_status", data)
 
 
-def unsafe_work_hours(hourly_forecast: List[HourlyForecast]) -> List[str]:
+def unsafe_work_hours(hourly_forecast: Hourly) -> List[str]:
     """
-    Identifies unsafe work hours based on heat index
+    Identifies unsafe work hours: heat index at or above the unsafe_heat_index
+    threshold (the same one the UNSAFE work status rule uses)
     
     Returns:
         List of time strings (e.g., ["12:00", "13:00", "14:00"])
     """
+    limit = rule_engine.threshold("unsafe_heat_index")
+    if isinstance(hourly_forecast, HourlySeries):
+        return hourly_forecast.labels(np.flatnonzero(hourly_forecast.heat_index >= limit))
+    
     unsafe_hours = []
     for hour in hourly_forecast:
-        if hour.heat_index >= 41:
+        if hour.heat_index >= limit:
             unsafe_hours.append(hour.time)
     return unsafe_hours
 
 
-def get_worker_decision(data: WeatherInput, hourly: List[HourlyForecast]) -> Dict[str, Any]:
+def get_worker_decision(data: WeatherInput, hourly: Hourly) -> Dict[str, Any]:
     """
     Complete worker mode decision package
     
@@ -133,9 +263,7 @@ def spraying_suitability(data: WeatherInput) -> str:
     Returns:
         "SUITABLE" | "NOT SUITABLE"
     """
-    if data.rain_probability < 0.3 and data.wind_speed < 10:
-        return "SUITABLE"
-    return "NOT SUITABLE"
+    return rule_engine.decide("spraying_suitability", data)
 
 
 def crop_risk(data: WeatherInput) -> str:
@@ -145,11 +273,7 @@ def crop_risk(data: WeatherInput) -> str:
     Returns:
         "HIGH" | "MEDIUM" | "LOW"
     """
-    if data.rain_probability > 0.6:
-        return "HIGH"
-    elif data.rain_probability > 0.3:
-        return "MEDIUM"
-    return "LOW"
+    return rule_engine.decide("crop_risk", data)
 
 
 def get_farmer_decision(data: WeatherInput) -> Dict[str, Any]:
@@ -204,27 +328,27 @@ def todays_key_tip(data: WeatherInput) -> str:
     Returns:
         Clear, actionable advice string
     """
-    if data.rain_probability > 0.6:
-        return "Avoid travel in the evening due to rain"
-    if data.heat_index > 38:
-        return "Limit outdoor activity at midday"
-    return "Weather conditions are generally comfortable"
+    return rule_engine.decide("todays_key_tip", data)
 
 
-def next_6_hour_risk(hourly_forecast: List[HourlyForecast]) -> str:
+def next_6_hour_risk(hourly_forecast: Hourly) -> str:
     """
-    Assesses risk level for next 6 hours
+    Assesses risk level for next 6 hours (rain probability above rain_risk)
     
     Returns:
         "RISKY" | "SAFE"
     """
+    limit = rule_engine.threshold("rain_risk")
+    if isinstance(hourly_forecast, HourlySeries):
+        return "RISKY" if (hourly_forecast.rain_probability[:6] > limit).any() else "SAFE"
+    
     for hour in hourly_forecast[:6]:
-        if hour.rain_probability > 0.6:
+        if hour.rain_probability > limit:
             return "RISKY"
     return "SAFE"
 
 
-def get_general_decision(data: WeatherInput, hourly: List[HourlyForecast]) -> Dict[str, Any]:
+def get_general_decision(data: WeatherInput, hourly: Hourly) -> Dict[str, Any]:
     """
     Complete general mode decision package
     
@@ -302,7 +426,7 @@ def why_this_advice(triggers: Dict[str, Any]) -> Dict[str, Any]:
 def get_smart_guidance(
     mode: str,
     current_weather: WeatherInput,
-    hourly_forecast: List[HourlyForecast]
+    hourly_forecast: Hourly
 ) -> Dict[str, Any]:
     """
     Master function that routes to appropriate mode logic
@@ -310,7 +434,7 @@ def get_smart_guidance(
     Args:
         mode: "worker" | "farmer" | "student" | "general"
         current_weather: Current weather conditions
-        hourly_forecast: Next 24 hours forecast
+        hourly_forecast: Next 24 hours forecast (list or HourlySeries)
     
     Returns:
         Complete decision package for the specified mode
@@ -322,7 +446,7 @@ def get_smart_guidance(
     elif mode == "student":
         # Student mode uses general logic + specific additions
         decision = get_general_decision(current_weather, hourly_forecast)
-        decision["study_comfort"] = "GOOD" if current_weather.heat_index < 35 else "POOR"
+        decision["study_comfort"] = "GOOD" if current_weather.heat_index < rule_engine.threshold("study_heat_index") else "POOR"
     else:  # general
         decision = get_general_decision(current_weather, hourly_forecast)
     
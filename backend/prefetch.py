@@ -0,0 +1,171 @@
+"""
+Location Prefetch Scheduler
+Keeps weather for every division/district warm so request handlers never wait on Open-Meteo
+Refreshes are aligned to Open-Meteo's hourly update, with jittered retries and backoff
+All pending locations are fetched together through one batched upstream call
+"""
+
+import asyncio
+import datetime
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from weather_cache import WeatherCache
+
+
+@dataclass
+class RefreshStatus:
+    """Refresh bookkeeping for one location"""
+    last_attempt: Optional[float] = None
+    last_success: Optional[float] = None
+    last_error: Optional[str] = None
+    consecutive_failures: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "last_attempt": _iso(self.last_attempt),
+            "last_success": _iso(self.last_success),
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+            "age_seconds": round(time.time() - self.last_success, 1) if self.last_success else None,
+        }
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc).isoformat()
+
+
+def seconds_until_next_slot(now: float, interval: float, offset: float) -> float:
+    """
+    Seconds until the next wall-clock slot, e.g. 5 minutes past every hour
+    for interval=3600, offset=300
+    """
+    next_slot = (now - offset) // interval * interval + interval + offset
+    return max(next_slot - now, 0.0)
+
+
+class DivisionRefresher:
+    """
+    Background task that refreshes a fixed set of locations into the weather cache
+
+    Each cycle fetches every location in one batch. Locations missing from the
+    batch result are retried with jittered exponential backoff; if they still fail,
+    the next cycle is pulled in (again with backoff) and only retries those.
+    """
+
+    def __init__(
+        self,
+        fetch_batch: Callable[[Dict[str, Dict[str, float]]], Awaitable[Dict[str, Optional[Dict[str, Any]]]]],
+        locations: Dict[str, Dict[str, float]],
+        cache: WeatherCache,
+        interval: float = 3600,
+        offset: float = 300,
+        max_retries: int = 3,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0,
+    ):
+        self.fetch_batch = fetch_batch
+        self.locations = locations
+        self.cache = cache
+        self.interval = interval
+        self.offset = offset
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.status: Dict[str, RefreshStatus] = {name: RefreshStatus() for name in locations}
+        self.next_run: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with +/-50% jitter, capped at backoff_max"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.5)
+
+    async def refresh(self, names=None) -> Dict[str, bool]:
+        """Refreshes the given locations (default: all) and reports success per name"""
+        pending = list(names) if names is not None else list(self.locations)
+        results: Dict[str, bool] = {}
+        for attempt in range(self.max_retries + 1):
+            started = time.time()
+            for name in pending:
+                self.status[name].last_attempt = started
+            fetched = await self.fetch_batch({name: self.locations[name] for name in pending})
+
+            for name in pending:
+                weather = fetched.get(name)
+                if weather is None:
+                    continue
+                coords = self.locations[name]
+                self.cache.put((coords['lat'], coords['lng']), weather)
+                status = self.status[name]
+                status.last_success = time.time()
+                status.last_error = None
+                status.consecutive_failures = 0
+                results[name] = True
+
+            pending = [name for name in pending if name not in results]
+            if not pending:
+                break
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.backoff(attempt))
+
+        for name in pending:
+            status = self.status[name]
+            status.last_error = "upstream fetch failed"
+            status.consecutive_failures += 1
+            results[name] = False
+        return results
+
+    async def _run(self) -> None:
+        pending = None  # None = refresh everything
+        while True:
+            results = await self.refresh(pending)
+            failed = [name for name, ok in results.items() if not ok]
+
+            delay = seconds_until_next_slot(time.time(), self.interval, self.offset)
+            if failed:
+                worst = max(self.status[name].consecutive_failures for name in failed)
+                retry_delay = self.backoff(self.max_retries + worst)
+                if retry_delay < delay:
+                    delay, pending = retry_delay, failed
+                else:
+                    pending = None
+            else:
+                pending = None
+
+            self.next_run = time.time() + delay
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Health/status view of the scheduler"""
+        healthy = all(s.last_success is not None and s.consecutive_failures == 0 for s in self.status.values())
+        return {
+            "status": "ok" if healthy else "degraded",
+            "scheduler": {
+                "running": self.running,
+                "interval_seconds": self.interval,
+                "next_run": _iso(self.next_run),
+            },
+            "locations": {name: s.to_dict() for name, s in self.status.items()},
+        }
@@ -0,0 +1,56 @@
+"""
+Response Field Projection
+Trims JSON payloads to the fields a client asks for via ?fields=a,b.c
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+FieldTree = Union[bool, Dict[str, "FieldTree"]]
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parses a fields query value ("a,b.c") into paths; None when no projection is requested
+    """
+    if not fields:
+        return None
+    paths = [f.strip() for f in fields.split(",") if f.strip()]
+    return paths or None
+
+
+def _field_tree(paths: List[str]) -> Dict[str, FieldTree]:
+    tree: Dict[str, FieldTree] = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is True:
+                break  # parent already selected whole
+            if child is None:
+                child = node[part] = {}
+            node = child
+        else:
+            node[parts[-1]] = True
+    return tree
+
+
+def _apply(value: Any, tree: FieldTree) -> Any:
+    if tree is True:
+        return value
+    if isinstance(value, list):
+        return [_apply(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _apply(value[key], sub) for key, sub in tree.items() if key in value}
+
+
+def project(payload: Dict[str, Any], paths: List[str]) -> Dict[str, Any]:
+    """
+    Keeps only the selected paths of payload
+
+    Dotted paths select nested keys, and apply to every element of a list,
+    e.g. "all_insights.summary" keeps only the summary of each insight.
+    Unknown paths are ignored.
+    """
+    return _apply(payload, _field_tree(paths))
@@ -0,0 +1,212 @@
+"""
+Upstream Resilience
+Circuit breaker, hedged requests, a hard deadline and a global rate limit
+around Open-Meteo calls
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from upstream import UpstreamClient
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the circuit is open"""
+
+
+class RateLimitedError(Exception):
+    """Raised instead of calling upstream when the rate limit can't be met in time"""
+
+
+class TokenBucket:
+    """
+    Token bucket with reservations: rate tokens per second, up to capacity
+
+    A call reserves its cost up front, possibly driving the balance negative;
+    the debt is its wait. Calls whose wait would exceed max_wait are refused
+    without reserving anything, so a surge queues at most max_wait seconds of
+    upstream budget. Costs above capacity are charged as capacity.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.rejected = 0
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float = 1) -> float:
+        """Seconds a call of this cost would wait right now"""
+        self._refill()
+        return max(min(cost, self.capacity) - self.tokens, 0) / self.rate
+
+    def reserve(self, cost: float = 1, max_wait: float = 0.0) -> Optional[float]:
+        """Reserves cost tokens; returns the wait in seconds, or None (nothing reserved) if it exceeds max_wait"""
+        wait = self.wait_time(cost)
+        if wait > max_wait:
+            self.rejected += 1
+            return None
+        self.tokens -= min(cost, self.capacity)
+        return wait
+
+    async def acquire(self, cost: float = 1, max_wait: float = 0.0) -> None:
+        wait = self.reserve(cost, max_wait)
+        if wait is None:
+            raise RateLimitedError(f"upstream rate limit ({self.rate:g}/s) exceeded")
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def status(self) -> Dict[str, Any]:
+        self._refill()
+        return {"rate_per_second": self.rate, "capacity": self.capacity, "tokens": round(self.tokens, 2), "rejected": self.rejected}
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker
+
+    closed: calls flow; failure_threshold consecutive failures open the circuit
+    open: calls fail fast for reset_timeout seconds
+    half_open: one trial call; success closes the circuit, failure reopens it
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """Gives back a half-open trial slot without a verdict (e.g. cancelled call)"""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+
+
+async def hedged(
+    call: Callable[[], Awaitable[Any]],
+    hedge_after: Optional[float],
+    allow_hedge: Optional[Callable[[], bool]] = None,
+) -> Any:
+    """
+    Runs call(); if it hasn't finished after hedge_after seconds, starts a
+    second identical call and returns whichever succeeds first
+    allow_hedge() is asked right before the second call; False skips it.
+    """
+    first = asyncio.ensure_future(call())
+    if not hedge_after:
+        return await first
+
+    pending = {first}
+    error: Optional[BaseException] = None
+    try:
+        # Cancelled while waiting out hedge_after: the finally cancels first too
+        done, _ = await asyncio.wait({first}, timeout=hedge_after)
+        if done:
+            return first.result()
+        if allow_hedge is not None and not allow_hedge():
+            return await first
+
+        pending.add(asyncio.ensure_future(call()))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class ResilientUpstream:
+    """
+    UpstreamClient wrapper: deadline per request, optional hedging, circuit
+    breaker and an optional global rate limit
+
+    cost: the call's share of the upstream quota (e.g. locations in a batch).
+    A hedge is only sent if the limiter has tokens for it right away.
+    """
+
+    def __init__(
+        self,
+        client: UpstreamClient,
+        breaker: CircuitBreaker,
+        deadline: float,
+        hedge_after: Optional[float] = None,
+        limiter: Optional[TokenBucket] = None,
+        max_wait: float = 0.0,
+    ):
+        self.client = client
+        self.breaker = breaker
+        self.deadline = deadline
+        self.hedge_after = hedge_after
+        self.limiter = limiter
+        self.max_wait = max_wait
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None, cost: float = 1) -> Any:
+        if self.limiter is not None:
+            if self.breaker.state == "open":  # don't spend quota on a call that will fail fast
+                raise CircuitOpenError("upstream circuit open")
+            await self.limiter.acquire(cost, self.max_wait)
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"upstream circuit {self.breaker.state}")
+        allow_hedge = None if self.limiter is None else lambda: self.limiter.reserve(cost) is not None
+        try:
+            result = await asyncio.wait_for(
+                hedged(lambda: self.client.get_json(url, params=params), self.hedge_after, allow_hedge),
+                timeout=self.deadline,
+            )
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "hedge_after_seconds": self.hedge_after,
+            "deadline_seconds": self.deadline,
+            "rate_limit": self.limiter.status() if self.limiter is not None else None,
+        }
@@ -0,0 +1,115 @@
+"""
+Materialized Response Store
+Pre-rendered JSON bodies per (endpoint, district, mode), rebuilt whenever a new
+weather snapshot arrives, so a request is a dict lookup plus a socket write
+"""
+
+import time
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from http_cache import conditional_response, encode_json, etag_for
+
+
+@dataclass
+class MaterializedResponse:
+    """Encoded body plus validators for one endpoint/district/mode"""
+    body: bytes
+    etag: str
+    last_modified: str
+    created_at: float
+    snapshot: Any
+    version: Any = None
+
+    @classmethod
+    def build(cls, payload: Any, snapshot: Any, created_at: float, version: Any = None) -> "MaterializedResponse":
+        body = encode_json(payload)
+        return cls(
+            body=body,
+            etag=etag_for(body),
+            last_modified=formatdate(created_at, usegmt=True),
+            created_at=created_at,
+            snapshot=snapshot,
+            version=version,
+        )
+
+    def to_response(self, request: Request, max_age: float, extra: Optional[Dict[str, Any]] = None) -> Response:
+        return conditional_response(request, self.body, max_age, self.etag, self.last_modified, extra)
+
+
+class ResponseStore:
+    """
+    Holds the materialized responses for every endpoint x district x mode
+
+    Entries remember the snapshot they were rendered from; get() only returns
+    an entry built from the snapshot the caller is currently holding.
+
+    versions: for endpoints whose output also depends on something that moves
+    while a snapshot is held (e.g. the current hour), a function of the
+    snapshot returning that something. An entry whose version no longer
+    matches is re-rendered in place on the next get().
+
+    endpoint_modes: modes to materialize for endpoints that don't use all of
+    them (e.g. a single one for mode-independent endpoints).
+    """
+
+    def __init__(
+        self,
+        builders: Dict[str, Callable[[Any, str, str], Any]],
+        modes: List[str],
+        versions: Optional[Dict[str, Callable[[Any], Any]]] = None,
+        endpoint_modes: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.builders = builders
+        self.modes = modes
+        self.versions = versions or {}
+        self.endpoint_modes = endpoint_modes or {}
+        self._entries: Dict[Tuple[str, str, str], MaterializedResponse] = {}
+        self.hits = 0
+        self.misses = 0
+        self.rerenders = 0
+
+    def _version(self, endpoint: str, weather: Any) -> Any:
+        version = self.versions.get(endpoint)
+        return None if version is None else version(weather)
+
+    def _render(self, endpoint: str, district: str, mode: str, weather: Any, created_at: float) -> MaterializedResponse:
+        payload = self.builders[endpoint](weather, district, mode)
+        entry = MaterializedResponse.build(payload, weather, created_at, self._version(endpoint, weather))
+        self._entries[(endpoint, district, mode)] = entry
+        return entry
+
+    def materialize(self, district: str, weather: Any, reuse: Tuple[str, ...] = ()) -> None:
+        """
+        Renders every endpoint x mode for a new snapshot
+
+        reuse: endpoints whose output is known not to have changed; their
+        existing entries are moved to the new snapshot, keeping body and ETag.
+        """
+        created_at = time.time()
+        for endpoint in self.builders:
+            for mode in self.endpoint_modes.get(endpoint, self.modes):
+                entry = self._entries.get((endpoint, district, mode))
+                if endpoint in reuse and entry is not None and entry.version == self._version(endpoint, weather):
+                    entry.snapshot = weather
+                    continue
+                self._render(endpoint, district, mode, weather, created_at)
+
+    def get(self, endpoint: str, district: str, mode: str, weather: Any) -> Optional[MaterializedResponse]:
+        entry = self._entries.get((endpoint, district, mode))
+        if entry is None or entry.snapshot is not weather:
+            self.misses += 1
+            return None
+        if endpoint in self.versions and entry.version != self._version(endpoint, weather):
+            self.rerenders += 1
+            entry = self._render(endpoint, district, mode, weather, time.time())
+        else:
+            self.hits += 1
+        return entry
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "rerenders": self.rerenders}
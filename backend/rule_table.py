@@ -0,0 +1,223 @@
+"""
+Declarative Rule Table
+Decision thresholds loaded from a JSON file and compiled once into evaluators
+
+Each decision is an ordered list of rules; the first rule whose conditions
+all hold wins, otherwise the default applies:
+
+    "work_safety_status": {
+        "rules": [
+            {"if": [["heat_index", ">=", "unsafe_heat_index"]], "then": "UNSAFE"},
+            {"if": [["lightning_risk", ">", 0.6]], "then": "UNSAFE"},
+            {"if": [["heat_index", ">=", 35]], "then": "CAUTION"}
+        ],
+        "default": "SAFE"
+    }
+
+Conditions compare a WeatherInput field with a number, or with a named
+threshold (["heat_index", ">=", "unsafe_heat_index"]) so a decision and the
+checks reading that threshold directly can't disagree. A decision compiles to
+a plain Python function for single evaluations and to np.select over boolean
+masks for whole arrays of locations. "thresholds" holds the named signal
+thresholds used by the insight engine.
+"""
+
+import json
+import math
+import operator
+import os
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "rules.json")
+
+INPUTS = (
+    "temperature", "humidity", "rain_probability", "wind_speed",
+    "heat_index", "lightning_risk", "forecast_stability",
+)
+OPERATORS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt,
+    ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+}
+
+# Looked up by name in the insight engine, the bulk engine and phase1_rules;
+# a rule file missing any of them is rejected instead of failing per request
+REQUIRED_THRESHOLDS = (
+    "heavy_rain", "flood_rain", "cyclone_wind", "heat_stress",
+    "unsafe_heat_index", "rain_risk", "study_heat_index",
+)
+REQUIRED_DECISIONS = (
+    "forecast_confidence", "work_safety_status", "crop_risk", "spraying_suitability", "todays_key_tip",
+)
+# Outcomes the engines branch on (advice text, safe windows); other labels are
+# rejected. Decisions not listed here (todays_key_tip) return free text.
+OUTCOMES = {
+    "forecast_confidence": ("HIGH", "MEDIUM", "LOW"),
+    "work_safety_status": ("UNSAFE", "CAUTION", "SAFE"),
+    "crop_risk": ("HIGH", "MEDIUM", "LOW"),
+    "spraying_suitability": ("SUITABLE", "NOT SUITABLE"),
+}
+
+Condition = Tuple[str, str, float]
+
+
+class RuleTableError(ValueError):
+    """Raised for a rule file that doesn't match the schema"""
+
+
+class Decision:
+    """One compiled decision: ordered (conditions, outcome) rules plus a default"""
+
+    def __init__(self, name: str, rules: List[Tuple[List[Condition], str]], default: str):
+        self.name = name
+        self.rules = rules
+        self.default = default
+        self.outcomes = tuple(dict.fromkeys([outcome for _, outcome in rules] + [default]))
+        self.evaluate = self._compile()
+
+    def _compile(self) -> Callable[[Any], str]:
+        """Generates `def decide(d): if d.x >= 41: return ...` from the validated rules"""
+        lines = ["def decide(d):"]
+        for conditions, outcome in self.rules:
+            test = " and ".join(f"d.{field} {op} {value!r}" for field, op, value in conditions)
+            lines.append(f"    if {test}: return {outcome!r}")
+        lines.append(f"    return {self.default!r}")
+        namespace: Dict[str, Any] = {}
+        exec(compile("\n".join(lines), f"<rule {self.name}>", "exec"), namespace)
+        return namespace["decide"]
+
+    def select(self, inputs: Mapping[str, np.ndarray], labels: Sequence[str]) -> np.ndarray:
+        """
+        Vectorized evaluation over arrays of inputs
+
+        Returns int8 indexes into labels (which must contain every outcome).
+        """
+        masks = []
+        for conditions, _ in self.rules:
+            mask = np.ones(np.shape(next(iter(inputs.values()))), dtype=bool)
+            for field, op, value in conditions:
+                mask &= OPERATORS[op](inputs[field], value)
+            masks.append(mask)
+        codes = [labels.index(outcome) for _, outcome in self.rules]
+        return np.select(masks, codes, labels.index(self.default)).astype(np.int8)
+
+
+class RuleSet:
+    """A fully compiled rule file"""
+
+    def __init__(self, thresholds: Dict[str, float], decisions: Dict[str, Decision], source: str = ""):
+        self.thresholds = thresholds
+        self.decisions = decisions
+        self.source = source
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any], source: str = "") -> "RuleSet":
+        thresholds = spec.get("thresholds", {})
+        missing = [name for name in REQUIRED_THRESHOLDS if name not in thresholds]
+        missing += [name for name in REQUIRED_DECISIONS if name not in spec.get("decisions", {})]
+        if missing:
+            raise RuleTableError(f"missing required thresholds/decisions: {', '.join(missing)}")
+        for name, value in thresholds.items():
+            _number(value, f"threshold {name}")
+        decisions = {}
+        for name, body in spec.get("decisions", {}).items():
+            if not name.isidentifier() or "default" not in body:
+                raise RuleTableError(f"decision {name!r} needs an identifier name and a default")
+            rules = []
+            for rule in body.get("rules", []):
+                conditions = []
+                for field, op, value in rule["if"]:
+                    if field not in INPUTS:
+                        raise RuleTableError(f"{name}: unknown input {field!r}")
+                    if op not in OPERATORS:
+                        raise RuleTableError(f"{name}: unknown operator {op!r}")
+                    if isinstance(value, str) and value in thresholds:
+                        value = thresholds[value]
+                    conditions.append((field, op, _number(value, f"{name}.{field}")))
+                if not conditions:
+                    raise RuleTableError(f"{name}: rule without conditions")
+                rules.append((conditions, str(rule["then"])))
+            decision = decisions[name] = Decision(name, rules, str(body["default"]))
+            unknown = [o for o in decision.outcomes if name in OUTCOMES and o not in OUTCOMES[name]]
+            if unknown:
+                raise RuleTableError(f"{name}: unknown outcome(s) {unknown}, expected one of {list(OUTCOMES[name])}")
+        return cls({k: float(v) for k, v in thresholds.items()}, decisions, source)
+
+    @classmethod
+    def load(cls, path: str) -> "RuleSet":
+        with open(path, encoding="utf-8") as f:
+            try:
+                spec = json.load(f)
+            except json.JSONDecodeError as e:
+                raise RuleTableError(f"{path}: {e}") from e
+        return cls.from_dict(spec, path)
+
+    def decide(self, name: str, data: Any) -> str:
+        return self.decisions[name].evaluate(data)
+
+
+def _number(value: Any, what: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise RuleTableError(f"{what}: expected a finite number, got {value!r}")
+    return value
+
+
+class RuleEngine:
+    """
+    Holds the active RuleSet and swaps in a recompiled one when the file changes
+
+    A file that fails to load or validate leaves the active rules in place, as
+    does a listener raising on the new rules (listeners then rerun on the old ones).
+    """
+
+    def __init__(self, path: str = DEFAULT_RULES_FILE):
+        self.path = path
+        self.rules = RuleSet.load(path)
+        self._mtime = os.path.getmtime(path)
+        self._listeners: List[Callable[[RuleSet], None]] = []
+
+    def subscribe(self, listener: Callable[[RuleSet], None]) -> None:
+        """listener(rules) runs after every successful reload"""
+        self._listeners.append(listener)
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        return self.reload()
+
+    def reload(self) -> bool:
+        try:
+            rules = RuleSet.load(self.path)
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            print(f"Rule table reload failed, keeping previous rules: {e}")
+            return False
+        previous, self.rules = self.rules, rules
+        error = self._notify(rules)
+        if error is not None:
+            print(f"Rule table reload failed in a listener, restoring previous rules: {error!r}")
+            self.rules = previous
+            self._notify(previous)
+            return False
+        return True
+
+    def _notify(self, rules: RuleSet) -> Optional[Exception]:
+        """Runs every listener; returns the first error instead of raising it"""
+        error = None
+        for listener in self._listeners:
+            try:
+                listener(rules)
+            except Exception as e:
+                error = error or e
+        return error
+
+    def decide(self, name: str, data: Any) -> str:
+        return self.rules.decide(name, data)
+
+    def threshold(self, name: str) -> float:
+        return self.rules.thresholds[name]
@@ -0,0 +1,275 @@
+"""
+Shared Weather State
+Memory-mapped, fixed-layout array store for per-location weather, shared by
+every uvicorn/gunicorn worker process on the host
+
+One worker wins an flock and becomes the writer (it runs the prefetch
+scheduler); the others map the same file read-only and import locations
+whose generation counter moved. Upstream calls and the numeric series are
+therefore held once per host instead of once per worker.
+
+Layout (all little-endian 8-byte cells):
+    header   int64[8]        magic, version, n_locations, n_hours, n_days, names_hash, seq, reserved
+    meta     float64[N, 8]   generation, fetched_at, current_minute, hourly_start_minute,
+                             daily_start_day, hours_valid, days_valid, utc_offset_seconds
+    current  float64[N, 5]   temperature, humidity, precipitation, windspeed, condition index
+    hourly   float64[N, 4, H] temperature_2m, relative_humidity_2m, precipitation, weathercode
+    daily    float64[N, 2, D] temperature_2m_max, temperature_2m_min
+
+Times are stored as minutes (days for dates) since 1970-01-01 of Open-Meteo's
+local wall-clock strings. Missing values are NaN and decode back to None.
+"""
+
+import datetime
+import fcntl
+import hashlib
+import mmap
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = int.from_bytes(b"BDWXSHM1", "little", signed=True)
+VERSION = 2
+HEADER_CELLS = 8
+META_CELLS = 8
+CURRENT_FIELDS = ("temperature", "humidity", "precipitation", "windspeed", "condition")
+HOURLY_FIELDS = ("temperature_2m", "relative_humidity_2m", "precipitation", "weathercode")
+DAILY_FIELDS = ("temperature_2m_max", "temperature_2m_min")
+INT_FIELDS = {"humidity", "relative_humidity_2m", "weathercode"}  # Open-Meteo sends these as integers
+CONDITIONS = ("Clear", "Cloudy", "Foggy", "Rainy", "Snowy", "Stormy", "Variable")
+
+SEQ = 6  # header cell holding the seqlock counter
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _names_hash(names: List[str]) -> int:
+    digest = hashlib.sha1("\n".join(names).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little", signed=True)
+
+
+def _to_minute(stamp: str) -> float:
+    return (datetime.datetime.fromisoformat(stamp) - EPOCH).total_seconds() / 60
+
+
+def _from_minute(minute: float) -> str:
+    return (EPOCH + datetime.timedelta(minutes=int(minute))).strftime("%Y-%m-%dT%H:%M")
+
+
+def _to_day(date: str) -> float:
+    return float((datetime.date.fromisoformat(date) - EPOCH.date()).days)
+
+
+def _from_day(day: float) -> str:
+    return (EPOCH.date() + datetime.timedelta(days=int(day))).isoformat()
+
+
+def _decode(values: np.ndarray, as_int: bool) -> List[Any]:
+    out = values.tolist()
+    nan = np.isnan(values)
+    if nan.any() or as_int:
+        out = [None if missing else (int(v) if as_int else v) for v, missing in zip(out, nan.tolist())]
+    return out
+
+
+class SharedWeatherState:
+    """
+    Fixed-layout mmap of weather for a fixed, ordered list of location names
+    """
+
+    def __init__(self, path: str, names: List[str], hours: int = 168, days: int = 7):
+        self.path = path
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.hours = hours
+        self.days = days
+        self.is_writer = False
+        self._lock_fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._inode: Optional[int] = None
+        self._seen: Dict[int, float] = {}
+
+        n = len(self.names)
+        self._shapes = {
+            "header": (HEADER_CELLS,),
+            "meta": (n, META_CELLS),
+            "current": (n, len(CURRENT_FIELDS)),
+            "hourly": (n, len(HOURLY_FIELDS), hours),
+            "daily": (n, len(DAILY_FIELDS), days),
+        }
+        self.size = sum(int(np.prod(shape)) * 8 for shape in self._shapes.values())
+
+    # --- Lifecycle ---
+
+    def try_become_writer(self) -> bool:
+        """Takes the host-wide writer lock (non-blocking); kept for the life of the process"""
+        if self._lock_fd is None:
+            fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._lock_fd = fd
+        if not self.is_writer:
+            self._create()
+            self.is_writer = True
+        return True
+
+    def _create(self) -> None:
+        """
+        Initializes a new file and renames it over the old one. Readers may
+        still map the old file: truncating it in place would make their reads
+        fault (SIGBUS), a rename leaves their pages intact until they remap.
+        """
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.truncate(self.size)
+        self._map(writable=True, path=tmp)
+        self.meta[:] = np.nan
+        self.meta[:, 0] = 0
+        self.current[:] = np.nan
+        self.hourly[:] = np.nan
+        self.daily[:] = np.nan
+        self.header[:] = [MAGIC, VERSION, len(self.names), self.hours, self.days, _names_hash(self.names), 0, 0]
+        self._mm.flush()
+        os.replace(tmp, self.path)
+
+    def attach(self) -> bool:
+        """
+        Maps an existing file as a reader; False if it's missing or has another layout
+        A file replaced by a new writer since the last call is remapped
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return self._mm is not None
+        if self._mm is not None:
+            if st.st_ino == self._inode:
+                return True
+            self.close()
+            self._seen.clear()
+        if st.st_size != self.size:
+            return False
+        self._map(writable=False)
+        expected = [MAGIC, VERSION, len(self.names), self.hours, self.days, _names_hash(self.names)]
+        if self.header[:6].tolist() != expected:
+            self.close()
+            return False
+        return True
+
+    def _map(self, writable: bool, path: Optional[str] = None) -> None:
+        flags = os.O_RDWR if writable else os.O_RDONLY
+        fd = os.open(path or self.path, flags)
+        try:
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            self._mm = mmap.mmap(fd, self.size, access=access)
+            self._inode = os.fstat(fd).st_ino
+        finally:
+            os.close(fd)
+        offset = 0
+        for name, shape in self._shapes.items():
+            dtype = np.int64 if name == "header" else np.float64
+            view = np.ndarray(shape, dtype=dtype, buffer=self._mm, offset=offset)
+            setattr(self, name, view)
+            offset += int(np.prod(shape)) * 8
+
+    def close(self) -> None:
+        for name in self._shapes:
+            if hasattr(self, name):
+                delattr(self, name)
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self._inode = None
+
+    # --- Writer ---
+
+    def write(self, name: str, weather: Dict[str, Any], fetched_at: Optional[float] = None) -> None:
+        i = self.index.get(name)
+        if i is None or not self.is_writer:
+            return
+        hourly, daily = weather['hourly'], weather.get('daily') or {}
+        n_hours = min(len(hourly['time']), self.hours)
+        n_days = min(len(daily.get('time', [])), self.days)
+
+        self.header[SEQ] += 1  # odd: write in progress
+        try:
+            self.current[i] = [
+                weather['temperature'], weather['humidity'], weather['precipitation'], weather['windspeed'],
+                CONDITIONS.index(weather['condition']) if weather['condition'] in CONDITIONS else np.nan,
+            ]
+            self.hourly[i] = np.nan
+            for f, field in enumerate(HOURLY_FIELDS):
+                values = hourly.get(field)
+                if values is not None:
+                    self.hourly[i, f, :n_hours] = np.asarray(values[:n_hours], dtype=np.float64)
+            self.daily[i] = np.nan
+            for f, field in enumerate(DAILY_FIELDS):
+                if field in daily:
+                    self.daily[i, f, :n_days] = np.asarray(daily[field][:n_days], dtype=np.float64)
+            self.meta[i, 1:8] = [
+                time.time() if fetched_at is None else fetched_at,
+                _to_minute(weather['time']) if weather.get('time') else np.nan,
+                _to_minute(hourly['time'][0]) if n_hours else np.nan,
+                _to_day(daily['time'][0]) if n_days else np.nan,
+                n_hours,
+                n_days,
+                weather.get('utc_offset_seconds', np.nan),
+            ]
+            self.meta[i, 0] += 1
+        finally:
+            self.header[SEQ] += 1  # even: consistent
+
+    # --- Reader ---
+
+    def read(self, name: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Decodes one location back into a weather dict (same shape as
+        fetch_real_weather) plus its fetched_at; None if never written
+        """
+        i = self.index[name]
+        for _ in range(100):
+            seq = int(self.header[SEQ])
+            if seq % 2 == 0:
+                result = self._decode(i)
+                if int(self.header[SEQ]) == seq:
+                    return result
+            time.sleep(0.001)
+        return None
+
+    def _decode(self, i: int) -> Optional[Tuple[Dict[str, Any], float]]:
+        meta = self.meta[i].copy()
+        if meta[0] == 0:
+            return None
+        n_hours, n_days = int(meta[5]), int(meta[6])
+        current = self.current[i]
+        condition = current[4]
+        weather = {
+            "time": None if np.isnan(meta[2]) else _from_minute(meta[2]),
+            "temperature": _decode(current[0:1], False)[0],
+            "condition": "Variable" if np.isnan(condition) else CONDITIONS[int(condition)],
+            "humidity": _decode(current[1:2], True)[0],
+            "precipitation": _decode(current[2:3], False)[0],
+            "windspeed": _decode(current[3:4], False)[0],
+        }
+        if not np.isnan(meta[7]):
+            weather['utc_offset_seconds'] = int(meta[7])  # same key order as parse_weather
+        weather['hourly'] = {"time": [_from_minute(meta[3] + 60 * h) for h in range(n_hours)]}
+        weather['daily'] = {"time": [_from_day(meta[4] + d) for d in range(n_days)]}
+        for f, field in enumerate(HOURLY_FIELDS):
+            weather['hourly'][field] = _decode(self.hourly[i, f, :n_hours], field in INT_FIELDS)
+        for f, field in enumerate(DAILY_FIELDS):
+            weather['daily'][field] = _decode(self.daily[i, f, :n_days], False)
+        return weather, float(meta[1])
+
+    def changed(self) -> List[str]:
+        """Names whose generation moved since the last call (reader side)"""
+        generations = self.meta[:, 0].copy()
+        names = []
+        for i, generation in enumerate(generations.tolist()):
+            if generation and self._seen.get(i) != generation:
+                self._seen[i] = generation
+                names.append(self.names[i])
+        return names
@@ -0,0 +1,144 @@
+"""
+Persistent Weather Snapshot Store
+SQLite-backed history of fetched weather, keyed by location and forecast time
+
+Used to warm the in-memory cache on startup (no cold stampede after a deploy)
+and to look up real daily values for day-over-day comparisons.
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_codec import dumps, loads
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    lat REAL NOT NULL,
+    lng REAL NOT NULL,
+    location TEXT NOT NULL,
+    forecast_time TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (lat, lng, forecast_time)
+);
+CREATE INDEX IF NOT EXISTS snapshots_latest ON snapshots (lat, lng, fetched_at);
+
+CREATE TABLE IF NOT EXISTS daily_history (
+    lat REAL NOT NULL,
+    lng REAL NOT NULL,
+    date TEXT NOT NULL,
+    temp_max REAL,
+    temp_min REAL,
+    PRIMARY KEY (lat, lng, date)
+);
+"""
+
+Key = Tuple[float, float]
+
+
+class SnapshotStore:
+    """
+    Append-mostly snapshot history
+
+    Each save() records the full weather dict and upserts the day the snapshot
+    starts on into daily_history. Rows older than retention_days are pruned.
+
+    save_later() is the event-loop entry point: it queues the snapshot for a
+    single writer thread with its own connection (WAL lets reads go on
+    meanwhile). A location saved again before its turn only writes the newest
+    snapshot, so the queue never holds more than one entry per location.
+    """
+
+    def __init__(self, path: str, retention_days: float = 7):
+        self.path = path
+        self.retention_days = retention_days
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._write_conn = sqlite3.connect(path, check_same_thread=False)
+        self._write_lock = threading.Lock()
+        self._last_prune = 0.0
+        self._pending: Dict[Key, Tuple[Dict[str, Any], float, str]] = {}
+        self._pending_lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-writer")
+        self.write_errors = 0
+
+    def save_later(self, key: Key, weather: Dict[str, Any], fetched_at: Optional[float] = None, location: str = "") -> None:
+        """Queues save() for the writer thread; returns at once"""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._pending_lock:
+            idle = not self._pending
+            self._pending[key] = (weather, fetched_at, location)
+        if idle:
+            self._writer.submit(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with self._pending_lock:
+                if not self._pending:
+                    return
+                key = next(iter(self._pending))
+                weather, fetched_at, location = self._pending.pop(key)
+            try:
+                self.save(key, weather, fetched_at, location)
+            except sqlite3.Error as e:
+                self.write_errors += 1
+                print(f"Snapshot save failed for {location or key}: {e}")
+
+    def flush(self) -> None:
+        """Blocks until every queued snapshot is written"""
+        self._writer.submit(lambda: None).result()
+
+    def save(self, key: Key, weather: Dict[str, Any], fetched_at: Optional[float] = None, location: str = "") -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        lat, lng = key
+        daily = weather.get('daily') or {}
+        payload = dumps(weather)
+        with self._write_lock, self._write_conn:
+            self._write_conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                (lat, lng, location, weather.get('time', ''), fetched_at, payload),
+            )
+            if daily.get('time'):
+                self._write_conn.execute(
+                    "INSERT OR REPLACE INTO daily_history VALUES (?, ?, ?, ?, ?)",
+                    (lat, lng, daily['time'][0], daily['temperature_2m_max'][0], daily['temperature_2m_min'][0]),
+                )
+        if fetched_at - self._last_prune > 3600:
+            self.prune(fetched_at)
+
+    def prune(self, now: Optional[float] = None) -> None:
+        cutoff = (time.time() if now is None else now) - self.retention_days * 86400
+        cutoff_date = time.strftime("%Y-%m-%d", time.gmtime(cutoff))
+        with self._write_lock, self._write_conn:
+            self._write_conn.execute("DELETE FROM snapshots WHERE fetched_at < ?", (cutoff,))
+            self._write_conn.execute("DELETE FROM daily_history WHERE date < ?", (cutoff_date,))
+        self._last_prune = time.time() if now is None else now
+
+    def load_latest(self) -> List[Tuple[Key, Dict[str, Any], float]]:
+        """Most recent snapshot per location as (key, weather, fetched_at)"""
+        rows = self._conn.execute(
+            """
+            SELECT s.lat, s.lng, s.payload, s.fetched_at FROM snapshots s
+            JOIN (SELECT lat, lng, MAX(fetched_at) AS latest FROM snapshots GROUP BY lat, lng) m
+              ON s.lat = m.lat AND s.lng = m.lng AND s.fetched_at = m.latest
+            """
+        ).fetchall()
+        return [((lat, lng), loads(payload), fetched_at) for lat, lng, payload, fetched_at in rows]
+
+    def daily(self, key: Key, date: str) -> Optional[Dict[str, float]]:
+        """Recorded max/min for one location and date (YYYY-MM-DD)"""
+        row = self._conn.execute(
+            "SELECT temp_max, temp_min FROM daily_history WHERE lat = ? AND lng = ? AND date = ?",
+            (key[0], key[1], date),
+        ).fetchone()
+        return None if row is None else {"temp_max": row[0], "temp_min": row[1]}
+
+    def close(self) -> None:
+        """Writes what is queued, then closes both connections"""
+        self._writer.shutdown(wait=True)
+        self._write_conn.close()
+        self._conn.close()
@@ -0,0 +1,92 @@
+"""
+Nearest-Location Spatial Index
+Snaps arbitrary GPS coordinates to the nearest row of a LocationTable using
+fixed-size lat/lng grid buckets, so lookups only scan nearby cells
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from bulk_engine import LocationTable
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.0  # lower bound for one degree of latitude (and of longitude near the equator)
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class NearestLocationIndex:
+    """
+    Grid-bucket nearest neighbour index over a LocationTable
+
+    Args:
+        cell_deg: bucket size in degrees
+        max_distance_km: points farther than this from every location don't snap
+    """
+
+    def __init__(self, table: LocationTable, cell_deg: float = 0.5, max_distance_km: float = 100.0):
+        self.table = table
+        self.cell_deg = cell_deg
+        self.max_distance_km = max_distance_km
+        self._buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i in range(len(table)):
+            self._buckets[self._cell(table.lat[i], table.lng[i])].append(i)
+        # Latitudes that can be within max_distance_km of some location (a degree of latitude is >= KM_PER_DEGREE)
+        margin = max_distance_km / KM_PER_DEGREE
+        self._lat_band = (float(min(table.lat)) - margin, float(max(table.lat)) + margin) if len(table) else (0.0, -1.0)
+        rows, cols = [c[0] for c in self._buckets], [c[1] for c in self._buckets]
+        self._cell_box = (min(rows), max(rows), min(cols), max(cols)) if self._buckets else (0, 0, 0, 0)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg))
+
+    def _ring(self, center: Tuple[int, int], r: int):
+        cy, cx = center
+        if r == 0:
+            yield center
+            return
+        for dx in range(-r, r + 1):
+            yield (cy - r, cx + dx)
+            yield (cy + r, cx + dx)
+        for dy in range(-r + 1, r):
+            yield (cy + dy, cx - r)
+            yield (cy + dy, cx + r)
+
+    def nearest(self, lat: float, lng: float) -> Optional[Tuple[int, float]]:
+        """
+        Returns (row index, distance in km) of the nearest location,
+        or None if nothing lies within max_distance_km
+        Raises ValueError for NaN or infinite coordinates.
+        """
+        if not (math.isfinite(lat) and math.isfinite(lng)):
+            raise ValueError(f"non-finite coordinates ({lat}, {lng})")
+        if not self._lat_band[0] <= lat <= self._lat_band[1]:
+            return None
+        center = self._cell(lat, lng)
+        # Every point in ring r is at least (r - 1) cells away from the query; no ring
+        # beyond the farthest occupied cell can hold a location
+        cell_km = self.cell_deg * KM_PER_DEGREE * math.cos(math.radians(min(abs(lat) + self.cell_deg, 89.0)))
+        min_row, max_row, min_col, max_col = self._cell_box
+        extent = max(center[0] - min_row, max_row - center[0], center[1] - min_col, max_col - center[1], 0)
+        max_ring = min(int(self.max_distance_km / cell_km) + 2, extent)
+
+        best: Optional[Tuple[int, float]] = None
+        for r in range(max_ring + 1):
+            if best is not None and (r - 1) * cell_km > best[1]:
+                break
+            for cell in self._ring(center, r):
+                for i in self._buckets.get(cell, ()):
+                    d = haversine_km(lat, lng, self.table.lat[i], self.table.lng[i])
+                    if best is None or d < best[1]:
+                        best = (i, d)
+
+        if best is None or best[1] > self.max_distance_km:
+            return None
+        return best
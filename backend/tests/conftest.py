@@ -0,0 +1,78 @@
+"""
+Shared test setup: `import main` offline (no shared memory, throwaway snapshot
+database, no background tasks) and an Open-Meteo stand-in serving the
+recorded fixture payloads
+"""
+
+import asyncio
+import copy
+import datetime
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+os.environ.update(
+    SHARED_STATE_PATH="",
+    SNAPSHOT_DB=os.path.join(tempfile.mkdtemp(prefix="tests-"), "snapshots.db"),
+    PREFETCH_ENABLED="0",
+    RULES_POLL="0",
+    NEWS_POLL="0",
+)
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from fake_open_meteo import load_fixtures, rebase  # noqa: E402
+
+
+def local_now() -> datetime.datetime:
+    """Wall time in Asia/Dhaka, the fixtures' timezone"""
+    return datetime.datetime.utcnow() + datetime.timedelta(hours=6)
+
+
+@pytest.fixture
+def fixture_payload():
+    """Monsoon fixture rebased to today"""
+    return rebase(load_fixtures()["open_meteo_monsoon"], local_now())
+
+
+class FakeUpstream:
+    """Replaces main.fetch_forecast: answers every point with payload, counting calls"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    async def __call__(self, kind, lats, lngs):
+        self.calls += 1
+        payloads = [copy.deepcopy(self.payload) for _ in lats]
+        return payloads[0] if len(payloads) == 1 else payloads
+
+
+@pytest.fixture
+def upstream(monkeypatch, fixture_payload):
+    """Empty caches and a fake upstream; restores the caches afterwards"""
+    fake = FakeUpstream(fixture_payload)
+    monkeypatch.setattr(main, "fetch_forecast", fake)
+    for key in main.LOCATION_BY_KEY:
+        main.weather_cache.invalidate(key)
+    main.evaluator.clear()
+    main.trend_cache.clear()
+    yield fake
+    for key in main.LOCATION_BY_KEY:
+        main.weather_cache.invalidate(key)
+    main.evaluator.clear()
+
+
+def get(path: str) -> httpx.Response:
+    async def request():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+    return asyncio.run(request())
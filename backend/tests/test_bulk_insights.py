@@ -0,0 +1,64 @@
+"""Bulk insights: partial results aren't cached downstream, an empty result is a 503"""
+
+import asyncio
+
+import main
+from conftest import get
+from resilience import RateLimitedError
+
+
+def fail_for(upstream, names):
+    """Upstream errors for any batch containing one of names"""
+    failing = {main.LOCATION_COORDS[n]["lat"] for n in names}
+    answer = upstream.__call__
+
+    async def call(kind, lats, lngs):
+        if failing & set(lats):
+            raise RuntimeError("upstream down")
+        return await answer(kind, lats, lngs)
+    return call
+
+
+def test_complete_response_is_cacheable(upstream):
+    response = get("/api/v1/insights/bulk?districts=Dhaka,Sylhet")
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+
+def test_partial_response_is_not_stored(upstream, monkeypatch):
+    get("/api/v1/insights/bulk?districts=Dhaka")
+    monkeypatch.setattr(main, "fetch_forecast", fail_for(upstream, ["Sylhet"]))
+
+    response = get("/api/v1/insights/bulk?districts=Dhaka,Sylhet")
+    assert response.status_code == 200
+    assert response.json()["unavailable"] == ["Sylhet"]
+    assert response.headers["cache-control"] == "no-store"
+
+
+def test_nothing_available_is_a_503(upstream, monkeypatch):
+    monkeypatch.setattr(main, "fetch_forecast", fail_for(upstream, ["Dhaka", "Sylhet"]))
+
+    response = get("/api/v1/insights/bulk?districts=Dhaka,Sylhet")
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 1
+
+
+def test_only_unknown_names_is_still_a_200(upstream):
+    response = get("/api/v1/insights/bulk?districts=Atlantis")
+    assert response.status_code == 200
+    assert response.json()["unknown"] == ["Atlantis"]
+
+
+def test_shed_batches_are_counted(upstream, monkeypatch):
+    async def refused(kind, lats, lngs):
+        raise RateLimitedError()
+
+    monkeypatch.setattr(main, "fetch_forecast", refused)
+    shed = main.weather_cache.shed
+
+    assert get("/api/v1/insights/bulk?districts=Dhaka,Sylhet").status_code == 503
+    assert main.weather_cache.shed == shed + 2
+    assert asyncio.run(main.fetch_weather_batch({"Dhaka": main.LOCATION_COORDS["Dhaka"]})) == {"Dhaka": None}
+    assert main.weather_cache.shed == shed + 3
+    assert f"bdweather_load_shed_total {shed + 3}" in get("/metrics").text
@@ -0,0 +1,63 @@
+"""The vectorized bulk engine must agree with the per-location path for every known location"""
+
+import copy
+import json
+
+import pytest
+
+import main
+from bulk_engine import WeatherGrid, evaluate
+from conftest import local_now
+from fake_open_meteo import load_fixtures, rebase
+from phase1_rules import rule_engine
+from rule_table import DEFAULT_RULES_FILE, RuleSet
+
+with open(DEFAULT_RULES_FILE, encoding="utf-8") as f:
+    SPEC = json.load(f)
+
+# Lower than the shipped values so each tunable check actually fires on the fixtures
+TUNED = {"flood_rain": 2.0, "unsafe_heat_index": 33.0, "rain_risk": 0.2, "study_heat_index": 30.0}
+
+
+@pytest.fixture(params=["shipped", "tuned"])
+def rules(request, monkeypatch):
+    if request.param == "tuned":
+        spec = {
+            "thresholds": {**rule_engine.rules.thresholds, **TUNED},
+            "decisions": copy.deepcopy(SPEC["decisions"]),
+        }
+        monkeypatch.setattr(rule_engine, "rules", RuleSet.from_dict(spec))
+    return rule_engine.rules
+
+
+def location_snapshots(payload, n):
+    """n parsed snapshots with varied current conditions"""
+    snapshots = []
+    for i in range(n):
+        weather = main.parse_weather(copy.deepcopy(payload))
+        weather['temperature'] += i % 9 - 4
+        weather['humidity'] = 55 + (i * 7) % 45
+        weather['precipitation'] = (i % 5) * 3.0
+        weather['windspeed'] = (i * 11) % 60
+        snapshots.append(weather)
+    return snapshots
+
+
+@pytest.mark.parametrize("fixture", ["open_meteo_monsoon", "open_meteo_premonsoon"])
+def test_bulk_matches_per_location_guidance_and_signals(fixture, rules):
+    table = main.LOCATIONS
+    names = table.names
+    snapshots = location_snapshots(rebase(load_fixtures()[fixture], local_now()), len(table))
+    result = evaluate(table, WeatherGrid.from_weather(snapshots), rules)
+
+    for i, (name, weather) in enumerate(zip(names, snapshots)):
+        coords = main.LOCATION_COORDS[name]
+        signals = sorted(s['type'] for s in main.get_signals(weather, coords['lat'], coords['lng'], name))
+        assert sorted(result.signal_types(i)) == signals, name
+        for mode in main.USER_MODES:
+            expected = main.build_smart_guidance(weather, name, mode)['decision']
+            for key, value in result.to_dict(i, mode)['decision'].items():
+                if key == "unsafe_hour_count":
+                    assert value == len(expected['unsafe_hours']), (name, mode, key)
+                else:
+                    assert value == expected[key], (name, mode, key)
@@ -0,0 +1,35 @@
+"""GPS coordinates: out-of-range or non-finite values are rejected, never a 500"""
+
+import math
+
+import pytest
+
+import main
+from conftest import get
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/alerts?lat=nan&lng=90",
+    "/api/v1/forecast?lat=inf&lng=90",
+    "/api/v1/insights/home?lat=23.7&lng=-inf",
+    "/api/v1/smart-guidance?lat=91&lng=90",
+    "/api/v1/alerts/stream?lat=23.7&lng=181",
+])
+def test_invalid_coordinates_are_rejected(path):
+    assert get(path).status_code == 422
+
+
+def test_gps_snaps_to_nearest_location(upstream):
+    body = get("/api/v1/insights/home?lat=24.9&lng=91.87").json()
+    assert body["location"]["district"] == "Sylhet"
+
+
+@pytest.mark.parametrize("lat, lng", [(math.nan, 90.0), (23.7, math.inf)])
+def test_nearest_rejects_non_finite(lat, lng):
+    with pytest.raises(ValueError):
+        main.location_index.nearest(lat, lng)
+
+
+@pytest.mark.parametrize("lat, lng", [(89.9, 0.0), (-89.9, 180.0), (24.0, 0.0)])
+def test_far_away_points_do_not_snap(lat, lng):
+    assert main.location_index.nearest(lat, lng) is None
@@ -0,0 +1,38 @@
+"""Hedged calls never leave an upstream request running after the caller is gone"""
+
+import asyncio
+
+from resilience import hedged
+
+
+def test_cancelling_before_the_hedge_cancels_the_first_call():
+    started, cancelled = [], []
+
+    async def call():
+        started.append(True)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        caller = asyncio.ensure_future(hedged(call, hedge_after=5))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        assert started == [True] and cancelled == [True]
+
+    asyncio.run(run())
+
+
+def test_slow_first_call_is_hedged():
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        await asyncio.sleep(0.2 if len(calls) == 1 else 0.01)
+        return len(calls)
+
+    assert asyncio.run(hedged(call, hedge_after=0.02)) == 2
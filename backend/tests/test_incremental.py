@@ -0,0 +1,19 @@
+"""Incremental evaluation: an unchanged fingerprint is reused until the evaluation expires"""
+
+from incremental import IncrementalEvaluator
+
+
+def test_get_re_evaluates_an_expired_entry():
+    now = [1000.0]
+    evaluator = IncrementalEvaluator(lambda weather, name: (name, now[0]), max_age=60, clock=lambda: now[0])
+    weather = {"temperature": 31.0, "condition": "Clear"}
+    changes = []
+    evaluator.subscribe(changes.append)
+
+    assert evaluator.get("Dhaka", weather) == ("Dhaka", 1000.0)
+    now[0] += 30
+    assert evaluator.get("Dhaka", dict(weather)) == ("Dhaka", 1000.0)
+    now[0] += 30
+    assert evaluator.get("Dhaka", dict(weather)) == ("Dhaka", 1060.0)
+    assert evaluator.evaluations == 2
+    assert changes == [["Dhaka"]]
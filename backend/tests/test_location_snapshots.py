@@ -0,0 +1,26 @@
+"""Weather snapshots are shared per coordinates and must not carry one caller's district"""
+
+import main
+from conftest import get
+
+
+def test_unknown_district_shares_snapshot_without_leaking_its_name(upstream):
+    foo = get("/api/v1/insights/home?district=Foo").json()
+    dhaka = get("/api/v1/insights/home?district=Dhaka").json()
+
+    assert upstream.calls == 1  # unknown names resolve to Dhaka's coordinates
+    assert foo["current_weather"]["district"] == "Foo"
+    assert dhaka["current_weather"]["district"] == "Dhaka"
+    coords = main.LOCATION_COORDS["Dhaka"]
+    assert "district" not in main.weather_cache.peek((coords["lat"], coords["lng"])).value
+
+
+def test_district_rules_apply_to_the_requesting_district_only(upstream):
+    upstream.payload["hourly"]["precipitation"] = [20.0] * len(upstream.payload["hourly"]["precipitation"])
+    upstream.payload["current_weather"]["windspeed"] = 5.0
+
+    sylhet_named = get("/api/v1/insights/home?district=Sylhet%20Sadar").json()
+    dhaka = get("/api/v1/insights/home?district=Dhaka").json()
+
+    assert sylhet_named["is_emergency"]  # flood risk for a Sylhet name
+    assert not dhaka["is_emergency"]
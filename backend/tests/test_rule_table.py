@@ -0,0 +1,91 @@
+"""Rule table validation and hot reload"""
+
+import copy
+import json
+
+import pytest
+
+from rule_table import DEFAULT_RULES_FILE, RuleEngine, RuleSet, RuleTableError
+
+with open(DEFAULT_RULES_FILE, encoding="utf-8") as f:
+    SPEC = json.load(f)
+
+
+@pytest.mark.parametrize("section,name", [("thresholds", "heat_stress"), ("decisions", "crop_risk")])
+def test_missing_required_entries_are_rejected(section, name):
+    spec = copy.deepcopy(SPEC)
+    del spec[section][name]
+    with pytest.raises(RuleTableError, match=name):
+        RuleSet.from_dict(spec)
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), "40"])
+def test_non_finite_numbers_are_rejected(value):
+    spec = copy.deepcopy(SPEC)
+    spec["thresholds"]["heat_stress"] = value
+    with pytest.raises(RuleTableError):
+        RuleSet.from_dict(spec)
+    spec = copy.deepcopy(SPEC)
+    spec["decisions"]["crop_risk"]["rules"][0]["if"][0][2] = value
+    with pytest.raises(RuleTableError):
+        RuleSet.from_dict(spec)
+
+
+def test_failing_listener_restores_previous_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(SPEC), encoding="utf-8")
+    engine = RuleEngine(str(path))
+    seen = []
+
+    def listener(rules):
+        seen.append(rules.thresholds["heat_stress"])
+        if rules.thresholds["heat_stress"] != 40.0:
+            raise KeyError("boom")
+
+    engine.subscribe(listener)
+    spec = copy.deepcopy(SPEC)
+    spec["thresholds"]["heat_stress"] = 45.0
+    path.write_text(json.dumps(spec), encoding="utf-8")
+
+    assert engine.reload() is False
+    assert engine.threshold("heat_stress") == 40.0
+    assert seen == [45.0, 40.0]
+
+
+@pytest.mark.parametrize("name,outcome", [("work_safety_status", "OK"), ("crop_risk", "NONE"), ("spraying_suitability", "YES")])
+def test_outcomes_outside_the_vocabulary_are_rejected(name, outcome):
+    spec = copy.deepcopy(SPEC)
+    spec["decisions"][name]["default"] = outcome
+    with pytest.raises(RuleTableError, match=outcome):
+        RuleSet.from_dict(spec)
+    spec = copy.deepcopy(SPEC)
+    spec["decisions"][name]["rules"][0]["then"] = outcome
+    with pytest.raises(RuleTableError, match=outcome):
+        RuleSet.from_dict(spec)
+
+
+def test_free_text_outcomes_are_accepted():
+    spec = copy.deepcopy(SPEC)
+    spec["decisions"]["todays_key_tip"]["default"] = "Enjoy the weather"
+    assert RuleSet.from_dict(spec).decisions["todays_key_tip"].default == "Enjoy the weather"
+
+
+def test_unsafe_status_and_unsafe_hours_share_one_threshold(monkeypatch):
+    import phase1_rules
+    from phase1_rules import HourlyForecast, WeatherInput, get_worker_decision
+
+    spec = copy.deepcopy(SPEC)
+    spec["thresholds"]["unsafe_heat_index"] = 40.0
+    monkeypatch.setattr(phase1_rules.rule_engine, "rules", RuleSet.from_dict(spec))
+    current = WeatherInput(36.0, 45.0, 0.1, 5.0, 40.5, 0.1, 0.2)
+    hourly = [HourlyForecast("12:00", 36.0, 45.0, 0.1, 40.5), HourlyForecast("13:00", 35.0, 40.0, 0.1, 39.0)]
+
+    decision = get_worker_decision(current, hourly)
+    assert decision["status"] == "UNSAFE" and decision["unsafe_hours"] == ["12:00"]
+
+
+def test_conditions_may_name_thresholds():
+    spec = copy.deepcopy(SPEC)
+    spec["decisions"]["crop_risk"]["rules"][0]["if"][0][2] = "rain_risk"
+    rules = RuleSet.from_dict(spec)
+    assert rules.decisions["crop_risk"].rules[0][0][0] == ("rain_probability", ">", 0.6)
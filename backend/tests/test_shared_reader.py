@@ -0,0 +1,53 @@
+"""Reader workers wait for the writer's snapshot on a cold miss instead of fetching upstream"""
+
+import asyncio
+
+import main
+from shared_state import SharedWeatherState
+
+
+def test_cold_miss_in_a_reader_waits_for_the_writer(upstream, monkeypatch, tmp_path, fixture_payload):
+    path, names = str(tmp_path / "state.bin"), list(main.LOCATION_COORDS)
+    writer = SharedWeatherState(path, names)
+    writer.try_become_writer()
+    reader = SharedWeatherState(path, names)
+    monkeypatch.setattr(main, "shared_state", reader)
+    monkeypatch.setattr(main, "PREFETCH_ENABLED", True)
+    weather = main.parse_weather(fixture_payload)
+
+    async def run():
+        monkeypatch.setattr(main, "shared_sync_task", asyncio.ensure_future(asyncio.sleep(60)))
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.2, writer.write, "Sylhet", weather, 1000.0)
+        loop.call_later(0.2, writer.write, "Dhaka", weather, 1000.0)
+        one = await main.get_cached_weather(main.LOCATION_COORDS["Sylhet"])
+        many = await main.get_cached_weather_many(["Dhaka", "Sylhet"])
+        main.shared_sync_task.cancel()
+        return one, many
+
+    one, many = asyncio.run(run())
+    assert upstream.calls == 0
+    assert one["temperature"] == weather["temperature"]
+    assert set(many) == {"Dhaka", "Sylhet"}
+    writer.close()
+    reader.close()
+
+
+def test_reader_fetches_itself_once_the_wait_runs_out(upstream, monkeypatch, tmp_path):
+    path, names = str(tmp_path / "state.bin"), list(main.LOCATION_COORDS)
+    writer = SharedWeatherState(path, names)
+    writer.try_become_writer()
+    monkeypatch.setattr(main, "shared_state", SharedWeatherState(path, names))
+    monkeypatch.setattr(main, "PREFETCH_ENABLED", True)
+    monkeypatch.setattr(main, "SHARED_STATE_WAIT", 0.2)
+
+    async def run():
+        monkeypatch.setattr(main, "shared_sync_task", asyncio.ensure_future(asyncio.sleep(60)))
+        weather = await main.get_cached_weather(main.LOCATION_COORDS["Sylhet"])
+        main.shared_sync_task.cancel()
+        return weather
+
+    assert asyncio.run(run()) is not None
+    assert upstream.calls == 1
+    main.shared_state.close()
+    writer.close()
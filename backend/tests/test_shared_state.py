@@ -0,0 +1,29 @@
+"""Shared weather state: a writer restart replaces the file, readers keep their map and then remap"""
+
+import main
+from shared_state import SharedWeatherState
+
+
+def test_new_writer_does_not_truncate_a_mapped_file(tmp_path, fixture_payload):
+    path, names = str(tmp_path / "state.bin"), ["Dhaka", "Sylhet"]
+    weather = main.parse_weather(fixture_payload)
+    writer = SharedWeatherState(path, names)
+    writer.try_become_writer()
+    writer.write("Dhaka", weather, fetched_at=1000.0)
+
+    reader = SharedWeatherState(path, names)
+    assert reader.attach()
+    assert reader.changed() == ["Dhaka"]
+
+    # A restarted writer must not shrink the file under the reader's mapping
+    writer.close()
+    writer._create()
+    assert reader.read("Dhaka")[1] == 1000.0
+
+    assert reader.attach()
+    assert reader.read("Dhaka") is None
+    writer.write("Sylhet", weather, fetched_at=2000.0)
+    assert reader.changed() == ["Sylhet"]
+    assert reader.read("Sylhet") == (writer.read("Sylhet")[0], 2000.0)
+    reader.close()
+    writer.close()
@@ -0,0 +1,27 @@
+"""On-disk snapshot history: writes are queued for the writer thread, newest snapshot per location wins"""
+
+import threading
+
+from snapshot_store import SnapshotStore
+
+
+def weather(temp, date="2026-10-17"):
+    return {"time": f"{date}T10:00", "temperature": temp, "daily": {"time": [date], "temperature_2m_max": [temp], "temperature_2m_min": [temp - 8]}}
+
+
+def test_save_later_writes_off_the_calling_thread(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path / "snapshots.db"))
+    writers = []
+    save = store.save
+    monkeypatch.setattr(store, "save", lambda *args: (writers.append(threading.current_thread().name), save(*args)))
+
+    store.save_later((23.8, 90.4), weather(31.0), location="Dhaka")
+    store.save_later((23.8, 90.4), weather(32.5), location="Dhaka")
+    store.save_later((24.9, 91.9), weather(29.0), location="Sylhet")
+    store.flush()
+
+    assert writers and all(name.startswith("snapshot-writer") for name in writers)
+    latest = {key: w["temperature"] for key, w, _ in store.load_latest()}
+    assert latest == {(23.8, 90.4): 32.5, (24.9, 91.9): 29.0}
+    assert store.daily((23.8, 90.4), "2026-10-17") == {"temp_max": 32.5, "temp_min": 24.5}
+    store.close()
@@ -0,0 +1,57 @@
+"""Weather cache: a failing listener is contained, the key keeps refreshing"""
+
+import asyncio
+
+from prefetch import DivisionRefresher
+from weather_cache import WeatherCache
+
+
+def failing_once():
+    failed = []
+
+    def listener(key, value):
+        if not failed:
+            failed.append(key)
+            raise KeyError("listener boom")
+    return listener, failed
+
+
+def test_failing_listener_does_not_wedge_a_key():
+    now = [0.0]
+    fetches = []
+
+    async def loader():
+        fetches.append(now[0])
+        return {"temperature": len(fetches)}
+
+    cache = WeatherCache(loader, ttl=10, stale_ttl=10, clock=lambda: now[0])
+    listener, failed = failing_once()
+    cache.subscribe(listener)
+
+    async def run():
+        assert await cache.get("Dhaka") == {"temperature": 1}
+        now[0] = 100
+        return await cache.get("Dhaka")
+
+    assert asyncio.run(run()) == {"temperature": 2}
+    assert failed == ["Dhaka"] and fetches == [0.0, 100]
+    assert cache.listener_errors == 1 and cache.stats()["in_flight"] == 0
+
+
+def test_failing_listener_does_not_stop_the_refresher():
+    locations = {"Dhaka": {"lat": 23.8, "lng": 90.4}, "Sylhet": {"lat": 24.9, "lng": 91.9}}
+
+    async def fetch_batch(batch):
+        return {name: {"temperature": 30.0} for name in batch}
+
+    async def never():
+        raise AssertionError("prefetched values must not be refetched")
+
+    cache = WeatherCache(never, ttl=10, stale_ttl=10)
+    listener, failed = failing_once()
+    cache.subscribe(listener)
+    refresher = DivisionRefresher(fetch_batch, locations, cache)
+
+    assert asyncio.run(refresher.refresh()) == {"Dhaka": True, "Sylhet": True}
+    assert failed == [(23.8, 90.4)]
+    assert cache.peek((23.8, 90.4)).value == {"temperature": 30.0}
@@ -0,0 +1,104 @@
+"""
+Hourly Time Axis
+Parsed, indexed view of a snapshot's hourly timestamps
+
+Open-Meteo returns hourly local wall-clock strings ("2026-06-01T14:00") at a
+fixed one-hour step, so the axis is just its first hour plus the UTC offset:
+looking up a timestamp or the current hour is arithmetic, not a list search.
+"now" is evaluated at call time, so a snapshot held in cache for hours keeps
+pointing at the right hour.
+"""
+
+import bisect
+import datetime
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+EPOCH = datetime.datetime(1970, 1, 1)
+HOUR = 3600
+
+
+def _local_seconds(stamp: str) -> float:
+    """Seconds since 1970-01-01T00:00 of a naive local timestamp"""
+    return (datetime.datetime.fromisoformat(stamp) - EPOCH).total_seconds()
+
+
+class TimeAxis:
+    """
+    Regular hourly axis: hour i is start + i hours (local time)
+
+    Irregular inputs (not a one-hour step) fall back to a binary search over
+    the parsed timestamps: hour i is the last one not after the lookup time.
+    """
+
+    __slots__ = ("times", "start", "length", "utc_offset", "_seconds")
+
+    def __init__(self, times, utc_offset_seconds: float = 0):
+        self.times = times
+        self.length = len(times)
+        self.utc_offset = utc_offset_seconds
+        self.start = _local_seconds(times[0]) if times else 0.0
+        self._seconds: Optional[List[float]] = None
+        if self.length > 1 and _local_seconds(times[-1]) - self.start != (self.length - 1) * HOUR:
+            self._seconds = [_local_seconds(t) for t in times]
+
+    @property
+    def regular(self) -> bool:
+        return self._seconds is None
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _position(self, local_seconds: float) -> int:
+        """Index of the hour containing local_seconds, unclamped"""
+        if self._seconds is None:
+            return int((local_seconds - self.start) // HOUR)
+        return bisect.bisect_right(self._seconds, local_seconds) - 1
+
+    def index_of(self, stamp: str) -> Optional[int]:
+        """Hour index containing a local timestamp (minutes are floored); None if outside the axis"""
+        position = self._position(_local_seconds(stamp))
+        return position if 0 <= position < self.length else None
+
+    def current_index(self, now: Optional[float] = None) -> int:
+        """Index of the hour containing now (epoch seconds), clamped to the axis"""
+        now = time.time() if now is None else now
+        position = self._position(now + self.utc_offset)
+        return min(max(position, 0), max(self.length - 1, 0))
+
+    def window(self, hours: int, now: Optional[float] = None) -> slice:
+        """The next `hours` hours starting at the current one"""
+        start = self.current_index(now)
+        return slice(start, min(start + hours, self.length))
+
+    def day_index(self, i: int) -> int:
+        """Days from the axis' first date to hour i's date (index into a daily block starting the same day)"""
+        seconds = self.start + i * HOUR if self._seconds is None else self._seconds[i]
+        return int(seconds // 86400 - self.start // 86400)
+
+    def label(self, i: int) -> str:
+        """"HH:MM" of hour i"""
+        return self.times[i][-5:]
+
+
+_axes: Dict[Tuple[Any, ...], TimeAxis] = {}
+
+
+def time_axis(weather: Dict[str, Any]) -> TimeAxis:
+    """
+    Axis for a weather snapshot, memoized on (first hour, length, offset)
+
+    A regular axis is fully determined by those, so snapshots from the same
+    hourly run share one instance and nothing is attached to the snapshot dict.
+    """
+    times = weather['hourly']['time']
+    offset = weather.get('utc_offset_seconds', 0)
+    key = (times[0] if times else None, len(times), offset)
+    axis = _axes.get(key)
+    if axis is None:
+        axis = TimeAxis(times, offset)
+        if axis.regular:
+            if len(_axes) >= 1024:
+                _axes.clear()
+            _axes[key] = axis
+    return axis
@@ -0,0 +1,282 @@
+"""
+Trend Engine
+Multi-day statistics of one forecast snapshot: daily aggregates of the hourly
+series, rolling means, day-over-day deltas, 7-day extremes and heat/rain streaks
+
+Everything is computed in one vectorized pass over the snapshot's hourly and
+daily blocks and kept per location until the next snapshot replaces it.
+Day-level results don't depend on the time of day; what to report "from
+today on" is chosen when rendering (see summary() and brief()).
+"""
+
+import datetime
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from time_axis import HOUR, time_axis
+
+RAIN_DAY_MM = 1.0  # WMO rain-day threshold (daily total)
+ROLLING_DAYS = 3  # trailing window for the rolling mean of daily highs
+TREND_MIN_CHANGE = 1.5  # degC change in the rolling high reported as warming/cooling
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+BN_WEEKDAYS = ["সোমবার", "মঙ্গলবার", "বুধবার", "বৃহস্পতিবার", "শুক্রবার", "শনিবার", "রবিবার"]
+
+Run = Tuple[int, int]  # (first day, length)
+
+
+def runs(mask: np.ndarray) -> List[Run]:
+    """Maximal runs of True as (start, length)"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return [(int(s), int(e - s)) for s, e in zip(edges[::2], edges[1::2])]
+
+
+def trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the last `window` values at each position (fewer at the start)"""
+    sums = np.cumsum(values)
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    shifted = np.concatenate((np.zeros(window), sums))[:len(values)]
+    return (sums - shifted) / counts
+
+
+def _daily_reduce(ufunc, values: np.ndarray, days: np.ndarray, n_days: int) -> np.ndarray:
+    """ufunc.reduce of the hourly values of each day (days is sorted); NaN for days without hours"""
+    out = np.full(n_days, np.nan)
+    if len(values):
+        present, starts = np.unique(days, return_index=True)
+        out[present] = ufunc.reduceat(values, starts)
+    return out
+
+
+@dataclass(slots=True)
+class Trends:
+    """Per-day arrays are aligned with dates (the snapshot's daily block)"""
+    dates: List[str]
+    temp_max: np.ndarray
+    temp_min: np.ndarray
+    temp_mean: np.ndarray
+    heat_index_max: np.ndarray
+    rain_total: np.ndarray
+    rain_hours: np.ndarray
+    rolling_max: np.ndarray
+    delta_max: np.ndarray  # temp_max change from the previous day, NaN for the first
+    heat_runs: List[Run]
+    rain_runs: List[Run]
+    peak_rain_24h: float  # wettest 24 consecutive hours (mm)
+    peak_rain_24h_start: Optional[str]
+    heat_threshold: float
+    _views: Dict[Tuple[str, int], Any] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _streak(self, streaks: List[Run], start: int) -> Optional[Dict[str, Any]]:
+        """Longest run still ahead of start day (clipped to it), earliest on ties"""
+        best = None
+        for first, length in streaks:
+            first, length = max(first, start), first + length - max(first, start)
+            if length > 0 and (best is None or length > best[1]):
+                best = (first, length)
+        if best is None:
+            return None
+        return {"start": self.dates[best[0]], "end": self.dates[best[0] + best[1] - 1], "days": best[1]}
+
+    def summary(self, start: int = 0) -> Dict[str, Any]:
+        """JSON view of day start (today) onwards; built once per start day"""
+        view = self._views.get(("summary", start))
+        if view is None:
+            view = self._views[("summary", start)] = self._summary(start)
+        return view
+
+    def brief(self, start: int = 0) -> Dict[str, str]:
+        """Weekly brief ({"text", "bn_text"}) from the strongest signals ahead: rain, heat, then the temperature trend"""
+        view = self._views.get(("brief", start))
+        if view is None:
+            view = self._views[("brief", start)] = self._brief(start)
+        return view
+
+    def _summary(self, start: int) -> Dict[str, Any]:
+        days = slice(start, len(self))
+        tmax, tmin, rain = self.temp_max[days], self.temp_min[days], self.rain_total[days]
+        dates = self.dates[days]
+
+        def extreme(values, pick) -> Optional[Dict[str, Any]]:
+            if not len(values) or np.all(np.isnan(values)):
+                return None
+            i = int(pick(values))
+            return {"date": dates[i], "value": _round(values[i])}
+
+        columns = {
+            "temp_max": self.temp_max, "temp_min": self.temp_min, "temp_mean": self.temp_mean,
+            "heat_index_max": self.heat_index_max, "rain_mm": self.rain_total, "rain_hours": self.rain_hours,
+            "rolling_temp_max": self.rolling_max, "temp_max_change": self.delta_max,
+        }
+        rounded = {name: _round_all(values[days]) for name, values in columns.items()}
+        rounded["rain_hours"] = [None if v is None else int(v) for v in rounded["rain_hours"]]
+        return {
+            "days": [
+                {"date": date, **{name: values[i] for name, values in rounded.items()}}
+                for i, date in enumerate(dates)
+            ],
+            "extremes": {
+                "hottest_day": extreme(tmax, np.nanargmax),
+                "coolest_night": extreme(tmin, np.nanargmin),
+                "wettest_day": extreme(rain, np.nanargmax),
+                "peak_24h_rain": {"start": self.peak_rain_24h_start, "value": _round(self.peak_rain_24h)},
+            },
+            "streaks": {
+                "heat": self._streak(self.heat_runs, start),
+                "rain": self._streak(self.rain_runs, start),
+            },
+            "heat_index_threshold": self.heat_threshold,
+        }
+
+    def _brief(self, start: int) -> Dict[str, str]:
+        if start >= len(self):
+            return {"text": "No outlook available yet.", "bn_text": "এখনও পূর্বাভাস পাওয়া যায়নি।"}
+        sentences: List[Tuple[str, str]] = []
+        rain = self._streak(self.rain_runs, start)
+        if rain and rain["days"] >= 2:
+            first = self.dates.index(rain["start"])
+            total = float(np.nansum(self.rain_total[first:first + rain["days"]]))
+            when, bn_when = _day_name(rain["start"], start, self.dates)
+            sentences.append((
+                f"Rain likely on {rain['days']} days in a row from {when} ({total:.0f} mm in total).",
+                f"{bn_when} থেকে টানা {rain['days']} দিন বৃষ্টির সম্ভাবনা (মোট {total:.0f} মিমি)।",
+            ))
+        heat = self._streak(self.heat_runs, start)
+        if heat and heat["days"] >= 2:
+            first = self.dates.index(heat["start"])
+            peak = float(np.nanmax(self.heat_index_max[first:first + heat["days"]]))
+            when, bn_when = _day_name(heat["start"], start, self.dates)
+            sentences.append((
+                f"Heat stress expected for {heat['days']} days from {when} (heat index up to {peak:.0f}).",
+                f"{bn_when} থেকে {heat['days']} দিন তাপ চাপের আশঙ্কা (তাপ সূচক সর্বোচ্চ {peak:.0f})।",
+            ))
+
+        rolling = self.rolling_max[start:]
+        change = float(rolling[-1] - rolling[0]) if len(rolling) > 1 else 0.0
+        last = self.dates[-1]
+        when, bn_when = _day_name(last, start, self.dates)
+        if change >= TREND_MIN_CHANGE:
+            sentences.append((
+                f"Warming trend: daytime highs rise about {change:.1f}°C by {when}.",
+                f"উষ্ণতা বাড়ছে: {bn_when} নাগাদ দিনের সর্বোচ্চ তাপমাত্রা প্রায় {change:.1f}°সে. বাড়বে।",
+            ))
+        elif change <= -TREND_MIN_CHANGE:
+            sentences.append((
+                f"Cooling trend: daytime highs drop about {-change:.1f}°C by {when}.",
+                f"তাপমাত্রা কমছে: {bn_when} নাগাদ দিনের সর্বোচ্চ তাপমাত্রা প্রায় {-change:.1f}°সে. কমবে।",
+            ))
+        elif not sentences:
+            low, high = float(np.nanmin(self.temp_max[start:])), float(np.nanmax(self.temp_max[start:]))
+            sentences.append((
+                f"Stable week: daytime highs between {low:.0f} and {high:.0f}°C.",
+                f"স্থিতিশীল সপ্তাহ: দিনের সর্বোচ্চ তাপমাত্রা {low:.0f} থেকে {high:.0f}°সে.।",
+            ))
+        return {"text": " ".join(s for s, _ in sentences[:2]), "bn_text": " ".join(b for _, b in sentences[:2])}
+
+
+def _round(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 1)
+
+
+def _round_all(values: np.ndarray) -> List[Optional[float]]:
+    """One decimal, NaN as None"""
+    return [None if v != v else v for v in np.round(values, 1).tolist()]
+
+
+def _day_name(date: str, today: int, dates: List[str]) -> Tuple[str, str]:
+    offset = dates.index(date) - today
+    if offset == 0:
+        return "today", "আজ"
+    if offset == 1:
+        return "tomorrow", "আগামীকাল"
+    weekday = datetime.date.fromisoformat(date).weekday()
+    return WEEKDAYS[weekday], BN_WEEKDAYS[weekday]
+
+
+def compute_trends(weather: Dict[str, Any], heat_threshold: float) -> Trends:
+    """
+    weather: parsed snapshot (hourly temperature_2m, relative_humidity_2m,
+    precipitation; daily time, temperature_2m_max/min)
+    heat_threshold: heat index (temp + humidity/10, as in the signal engine)
+    from which a day counts towards a heat streak
+    """
+    daily, hourly = weather['daily'], weather['hourly']
+    dates = list(daily.get('time') or [])
+    n_days = len(dates)
+    temp_max = np.asarray(daily['temperature_2m_max'][:n_days], dtype=float)
+    temp_min = np.asarray(daily['temperature_2m_min'][:n_days], dtype=float)
+
+    axis = time_axis(weather)
+    n = len(axis)
+    temp = np.asarray(hourly['temperature_2m'][:n], dtype=float)
+    rain = np.nan_to_num(np.asarray(hourly['precipitation'][:n], dtype=float))
+    heat_index = temp + np.asarray(hourly['relative_humidity_2m'][:n], dtype=float) / 10
+    if axis.regular:
+        days = ((axis.start + np.arange(n) * HOUR) // 86400 - axis.start // 86400).astype(np.intp)
+    else:
+        days = np.fromiter((axis.day_index(i) for i in range(n)), np.intp, n)
+    inside = days < n_days
+    days, temp, rain, heat_index = days[inside], temp[inside], rain[inside], heat_index[inside]
+
+    hours_per_day = np.bincount(days, minlength=n_days)[:n_days]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        temp_mean = np.bincount(days, weights=temp, minlength=n_days)[:n_days] / hours_per_day
+    rain_total = np.bincount(days, weights=rain, minlength=n_days)[:n_days]
+    rain_hours = np.bincount(days, weights=rain > 0, minlength=n_days)[:n_days]
+    heat_index_max = _daily_reduce(np.maximum, heat_index, days, n_days)
+
+    delta_max = np.concatenate(([np.nan], np.diff(temp_max))) if n_days else temp_max
+
+    # Wettest 24 consecutive hours
+    peak_24h, peak_start = 0.0, None
+    if len(rain):
+        window = min(24, len(rain))
+        sums = np.cumsum(np.concatenate(([0.0], rain)))
+        totals = sums[window:] - sums[:-window]
+        i = int(np.argmax(totals))
+        peak_24h = float(totals[i])
+        peak_start = hourly['time'][int(np.flatnonzero(inside)[i])] if peak_24h > 0 else None
+
+    return Trends(
+        dates=dates,
+        temp_max=temp_max,
+        temp_min=temp_min,
+        temp_mean=temp_mean,
+        heat_index_max=heat_index_max,
+        rain_total=rain_total,
+        rain_hours=rain_hours,
+        rolling_max=trailing_mean(temp_max, ROLLING_DAYS) if n_days else temp_max,
+        delta_max=delta_max,
+        heat_runs=runs(np.nan_to_num(heat_index_max) >= heat_threshold),
+        rain_runs=runs(rain_total >= RAIN_DAY_MM),
+        peak_rain_24h=peak_24h,
+        peak_rain_24h_start=peak_start,
+        heat_threshold=heat_threshold,
+    )
+
+
+class TrendCache:
+    """
+    Trends per location, computed on first use of a snapshot and kept until
+    a different snapshot is asked for (same identity check as ResponseStore)
+    """
+
+    def __init__(self, compute: Callable[[Dict[str, Any]], Trends]):
+        self.compute = compute
+        self._entries: Dict[Hashable, Tuple[Any, Trends]] = {}
+        self.computed = 0
+
+    def get(self, key: Hashable, weather: Dict[str, Any]) -> Trends:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not weather:
+            entry = self._entries[key] = (weather, self.compute(weather))
+            self.computed += 1
+        return entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
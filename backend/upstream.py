@@ -0,0 +1,64 @@
+"""
+Upstream HTTP Client
+Shared keep-alive connection pool for Open-Meteo calls
+Every request has a timeout and the number of in-flight calls is bounded
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+
+from json_codec import loads
+from metrics import stage
+
+
+class UpstreamClient:
+    """
+    Thin wrapper around a lazily created httpx.AsyncClient
+
+    The client is created on first use so it binds to the running event loop,
+    and is closed from the app lifespan on shutdown.
+    """
+
+    def __init__(self, timeout: float, max_connections: int, max_concurrency: int):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET url and decode the JSON body straight from the response bytes
+
+        Raises httpx.HTTPError on timeouts, connection errors and non-2xx responses.
+        """
+        with stage("upstream_wait"):
+            await self._semaphore.acquire()
+        try:
+            with stage("upstream_request"):
+                response = await self.client.get(url, params=params)
+        finally:
+            self._semaphore.release()
+        response.raise_for_status()
+        with stage("upstream_decode"):
+            return loads(response.content)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
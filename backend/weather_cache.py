@@ -0,0 +1,203 @@
+"""
+Weather Cache
+TTL + stale-while-revalidate cache in front of the Open-Meteo fetcher
+A single in-flight fetch per key is shared by every concurrent caller,
+whether it was started for one location or as part of a batch
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+
+class LoadShedError(Exception):
+    """Raised by a loader that refused to fetch (e.g. no upstream budget); retry_after in seconds"""
+
+    def __init__(self, retry_after: float = 1.0):
+        super().__init__("weather fetch shed under load")
+        self.retry_after = retry_after
+
+
+@dataclass
+class CacheEntry:
+    """A cached value and the moment it was fetched"""
+    value: Any
+    fetched_at: float
+
+
+class WeatherCache:
+    """
+    Keyed cache with TTL and stale-while-revalidate semantics
+
+    - age < ttl: served from cache
+    - ttl <= age < ttl + stale_ttl: stale value served, refresh runs in background
+    - otherwise: caller awaits the fetch (shared with other callers)
+
+    A loader returning None is treated as a failed fetch and never cached;
+    callers then get the last good value, however old it is.
+    Listeners registered with subscribe() are called with (key, value) for
+    every newly stored value; a listener raising is logged and counted in
+    listener_errors, the value stays stored.
+
+    A loader raising LoadShedError sheds the fetch: callers get the last good
+    value the same way, and the error itself only when there is none.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[..., Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._entries: Dict[Hashable, CacheEntry] = {}
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self._listeners: List[Callable[[Hashable, Any], None]] = []
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shed = 0
+        self.listener_errors = 0
+
+    async def get(self, key: Hashable, *args) -> Optional[Any]:
+        """
+        Returns the value for key, awaiting loader(*args) when needed
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self.clock() - entry.fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._start(key, lambda: self.loader(*args))
+                return entry.value
+
+        self.misses += 1
+        # Shield so a client disconnect never cancels the shared fetch
+        return await asyncio.shield(self._start(key, lambda: self.loader(*args)))
+
+    async def get_many(
+        self,
+        keys: Iterable[Hashable],
+        load_batch: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    ) -> Dict[Hashable, Any]:
+        """
+        get() for many keys; the ones needing a fetch and not already in
+        flight are loaded together by one load_batch(keys) call, which
+        returns {key: value or None}
+
+        Keys failing (or shed) with nothing cached are left out of the result.
+        """
+        now = self.clock()
+        values: Dict[Hashable, Any] = {}
+        waiting: List[Hashable] = []
+        refresh: List[Hashable] = []
+        for key in keys:
+            entry = self._entries.get(key)
+            age = None if entry is None else now - entry.fetched_at
+            if age is not None and age < self.ttl:
+                self.hits += 1
+                values[key] = entry.value
+                continue
+            if age is not None and age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                values[key] = entry.value
+            else:
+                self.misses += 1
+                waiting.append(key)
+            if key not in self._inflight:
+                refresh.append(key)
+
+        if refresh:
+            batch = asyncio.ensure_future(load_batch(refresh))
+            for key in refresh:
+                self._start(key, lambda key=key: self._from_batch(batch, key))
+
+        if waiting:
+            tasks = [self._inflight[key] for key in waiting]
+            results = await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
+            for key, value in zip(waiting, results):
+                if isinstance(value, BaseException):
+                    entry = self._entries.get(key)
+                    value = None if entry is None else entry.value
+                if value is not None:
+                    values[key] = value
+        return values
+
+    @staticmethod
+    async def _from_batch(batch: "asyncio.Future[Dict[Hashable, Any]]", key: Hashable) -> Optional[Any]:
+        return (await asyncio.shield(batch)).get(key)
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry]:
+        """Returns the raw cache entry without triggering a fetch"""
+        return self._entries.get(key)
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """Seconds since the entry for key was fetched, None if absent"""
+        entry = self._entries.get(key)
+        return None if entry is None else self.clock() - entry.fetched_at
+
+    def put(self, key: Hashable, value: Any, age: float = 0.0) -> None:
+        """
+        Stores a value fetched elsewhere (e.g. by the prefetch scheduler);
+        age backdates it, e.g. for snapshots restored from disk
+        """
+        self._store(key, value, age)
+
+    def subscribe(self, listener: Callable[[Hashable, Any], None]) -> None:
+        self._listeners.append(listener)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """get() outcomes: fresh hits, stale hits (refresh started) and misses (caller awaited a fetch)"""
+        return {
+            "entries": len(self._entries), "hits": self.hits, "stale_hits": self.stale_hits,
+            "misses": self.misses, "shed": self.shed, "in_flight": len(self._inflight),
+            "listener_errors": self.listener_errors,
+        }
+
+    def _start(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> "asyncio.Task[Any]":
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._run(key, fetch))
+        return task
+
+    async def _run(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        value = None
+        try:
+            value = await fetch()
+        except LoadShedError:
+            self.shed += 1
+            if key not in self._entries:
+                raise
+        finally:
+            # Popped first: a finished task left in _inflight would be returned forever
+            self._inflight.pop(key, None)
+            if value is not None:
+                self._store(key, value)
+            else:
+                # Failed or shed refresh: fall back to the last good snapshot
+                entry = self._entries.get(key)
+                if entry is not None:
+                    value = entry.value
+        return value
+
+    def _store(self, key: Hashable, value: Any, age: float = 0.0) -> None:
+        self._entries[key] = CacheEntry(value=value, fetched_at=self.clock() - age)
+        for listener in self._listeners:
+            try:
+                listener(key, value)
+            except Exception as e:
+                # A listener (materialization, shared state, history) failing must
+                # not fail the fetch, the prefetch loop or the shared-state sync
+                self.listener_errors += 1
+                print(f"Cache listener {getattr(listener, '__name__', listener)} failed for {key}: {e!r}")